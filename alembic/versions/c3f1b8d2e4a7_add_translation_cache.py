@@ -0,0 +1,48 @@
+"""add_translation_cache
+
+Revision ID: c3f1b8d2e4a7
+Revises: a5574fbe41de
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1b8d2e4a7'
+down_revision: Union[str, Sequence[str], None] = 'a5574fbe41de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'translation_cache',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('target_language', sa.String(10), nullable=False),
+        sa.Column('provider', sa.String(20), nullable=False),
+        sa.Column('glossary_version', sa.String(50), nullable=False),
+        sa.Column('source_file', sa.String(500), nullable=True),
+        sa.Column('translated_text', sa.Text(), nullable=False),
+        sa.Column('char_count', sa.Integer(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.Column('last_accessed_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('content_hash', 'target_language', 'provider', 'glossary_version',
+                            name='uq_translation_cache_key')
+    )
+    op.create_index('idx_translation_cache_source_file', 'translation_cache', ['source_file'])
+    op.create_index('idx_translation_cache_last_accessed_at', 'translation_cache', ['last_accessed_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_translation_cache_last_accessed_at', 'translation_cache')
+    op.drop_index('idx_translation_cache_source_file', 'translation_cache')
+    op.drop_table('translation_cache')
@@ -0,0 +1,45 @@
+"""add_translation_memory
+
+Revision ID: d8a4e6f1b2c9
+Revises: c3f1b8d2e4a7
+Create Date: 2026-10-19 14:03:27.540918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a4e6f1b2c9'
+down_revision: Union[str, Sequence[str], None] = 'c3f1b8d2e4a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'translation_memory',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('source_hash', sa.String(64), nullable=False),
+        sa.Column('source_text', sa.Text(), nullable=False),
+        sa.Column('target_language', sa.String(10), nullable=False),
+        sa.Column('provider', sa.String(20), nullable=False),
+        sa.Column('glossary_version', sa.String(50), nullable=False),
+        sa.Column('translated_text', sa.Text(), nullable=False),
+        sa.Column('signature', sa.LargeBinary(), nullable=False),
+        sa.Column('reuse_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source_hash', 'target_language', 'provider', 'glossary_version',
+                            name='uq_translation_memory_key')
+    )
+    op.create_index('idx_translation_memory_created_at', 'translation_memory', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_translation_memory_created_at', 'translation_memory')
+    op.drop_table('translation_memory')
@@ -0,0 +1,38 @@
+"""add_revoked_tokens
+
+Revision ID: e2b7c9a41f3d
+Revises: d8a4e6f1b2c9
+Create Date: 2026-10-19 16:41:08.213574
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c9a41f3d'
+down_revision: Union[str, Sequence[str], None] = 'd8a4e6f1b2c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('jti', sa.String(64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('jti')
+    )
+    op.create_index('idx_revoked_tokens_revoked_at', 'revoked_tokens', ['revoked_at'])
+    op.create_index('idx_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_revoked_tokens_expires_at', 'revoked_tokens')
+    op.drop_index('idx_revoked_tokens_revoked_at', 'revoked_tokens')
+    op.drop_table('revoked_tokens')
@@ -0,0 +1,75 @@
+"""hash_session_tokens
+
+Store the SHA-256 of each session token instead of the raw JWT.
+
+Revision ID: f4c1a9d3e8b2
+Revises: e2b7c9a41f3d
+Create Date: 2026-10-19 17:22:51.904316
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c1a9d3e8b2'
+down_revision: Union[str, Sequence[str], None] = 'e2b7c9a41f3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+sessions = sa.table(
+    'sessions',
+    sa.column('id', sa.UUID()),
+    sa.column('token', sa.String()),
+    sa.column('token_hash', sa.String()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sessions', sa.Column('token_hash', sa.String(64), nullable=True))
+
+    # Backfill existing sessions so nobody is signed out by the migration
+    bind = op.get_bind()
+    update = (
+        sessions.update()
+        .where(sessions.c.id == sa.bindparam('session_id'))
+        .values(token_hash=sa.bindparam('digest'))
+    )
+    while True:
+        rows = bind.execute(
+            sa.select(sessions.c.id, sessions.c.token)
+            .where(sessions.c.token_hash.is_(None))
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(update, [
+            {'session_id': row.id, 'digest': hashlib.sha256(row.token.encode('utf-8')).hexdigest()}
+            for row in rows
+        ])
+
+    op.alter_column('sessions', 'token_hash', nullable=False)
+    op.create_unique_constraint('uq_sessions_token_hash', 'sessions', ['token_hash'])
+    op.drop_index('idx_sessions_token', 'sessions')
+    # Also drops the unique constraint on the raw token
+    op.drop_column('sessions', 'token')
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Raw tokens cannot be recovered from their hashes, so existing sessions
+    are deleted and users have to sign in again.
+    """
+    op.execute(sessions.delete())
+    op.add_column('sessions', sa.Column('token', sa.String(500), nullable=False))
+    op.create_unique_constraint('sessions_token_key', 'sessions', ['token'])
+    op.create_index('idx_sessions_token', 'sessions', ['token'])
+    op.drop_constraint('uq_sessions_token_hash', 'sessions', type_='unique')
+    op.drop_column('sessions', 'token_hash')
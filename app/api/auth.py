@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
-from app.core.config import get_db
-from app.core.dependencies import get_current_user
+from app.core.config import get_db, AUTH_STATELESS
+from app.core.dependencies import get_current_user, require_admin, security
 from app.services.auth_service import AuthService
 from app.services.profile_service import ProfileService
+from app.services.session_sweeper import session_sweeper
 from app.schemas import (
     SignupRequest, SignupResponse,
     SigninRequest, SigninResponse,
+    RefreshRequest, RefreshResponse,
     UserResponse, ProfileResponse
 )
 from app.models import User
@@ -28,7 +31,7 @@ async def signup(
     - **profile**: Optional profile information
     """
     # Create user
-    user, token = AuthService.signup(
+    user, token, refresh_token = await AuthService.signup(
         db=db,
         email=signup_data.email,
         password=signup_data.password
@@ -47,7 +50,8 @@ async def signup(
     return SignupResponse(
         user=UserResponse.model_validate(user),
         profile=ProfileResponse.model_validate(profile) if profile else None,
-        token=token
+        token=token,
+        refresh_token=refresh_token
     )
 
 
@@ -63,7 +67,7 @@ async def signin(
     - **password**: User password
     """
     # Authenticate user
-    user, token = AuthService.signin(
+    user, token, refresh_token = await AuthService.signin(
         db=db,
         email=signin_data.email,
         password=signin_data.password
@@ -75,12 +79,36 @@ async def signin(
     return SigninResponse(
         user=UserResponse.model_validate(user),
         profile=ProfileResponse.model_validate(profile) if profile else None,
-        token=token
+        token=token,
+        refresh_token=refresh_token
     )
 
 
+@router.post("/refresh", response_model=RefreshResponse)
+async def refresh(
+    refresh_data: RefreshRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Exchange a refresh token for a new short-lived access token.
+
+    Only available when `AUTH_STATELESS` is enabled.
+
+    - **refresh_token**: Refresh token returned by signup/signin
+    """
+    if not AUTH_STATELESS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Refresh tokens are not enabled"
+        )
+
+    token = AuthService.refresh(db, refresh_data.refresh_token)
+    return RefreshResponse(token=token)
+
+
 @router.post("/signout", status_code=status.HTTP_204_NO_CONTENT)
 async def signout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -89,6 +117,7 @@ async def signout(
 
     Requires authentication.
     """
+    AuthService.signout(db, credentials.credentials)
     return None
 
 
@@ -102,3 +131,13 @@ async def get_current_user_info(
     Requires authentication.
     """
     return UserResponse.model_validate(current_user)
+
+
+@router.get("/sessions/sweeper")
+async def session_sweeper_stats(_: None = Depends(require_admin)):
+    """
+    Rows removed by the expired-session sweeper, in total and in its last run.
+
+    **Admin only**: requires the `X-Admin-Key` header.
+    """
+    return session_sweeper.stats()
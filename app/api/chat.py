@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 from uuid import UUID, uuid4
 from datetime import datetime
 
 from ..services.rag_service import rag_service  # Import the RAG service
-from ..services.profile_service import ProfileService
+from ..services.indexing_jobs import indexing_jobs
+from ..services.indexing_service import indexing_service
 from ..core.config import get_db, get_logger
-from ..core.dependencies import get_current_user_optional
+from ..core.dependencies import get_current_user_optional, require_admin
 from ..models import Message, Conversation, User
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
@@ -50,7 +51,7 @@ async def chat_endpoint(
     # Get user profile if authenticated for personalization
     user_profile = None
     if current_user:
-        user_profile = ProfileService.get_profile(db, current_user.id)
+        user_profile = current_user.profile
         logger.info(f"Chat request from authenticated user {current_user.email}, profile: {user_profile is not None}")
 
     # Process the question through RAG pipeline with optional personalization
@@ -74,17 +75,83 @@ async def chat_endpoint(
         logger.error(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during chat processing")
 
-@router.post("/index-book")
-async def index_book():
+@router.post("/index-book", status_code=status.HTTP_202_ACCEPTED)
+async def index_book(rebuild: bool = False, x_admin_key: Optional[str] = Header(None)):
     """
-    Endpoint to index the book content into the vector database.
+    Start indexing the book content into the vector database as a background job.
+
+    If an indexing job is already running, its ID is returned instead of
+    starting a second one. Poll `GET /index-book/{job_id}` for progress.
+
+    - **rebuild**: Build a new index version even if one is already live
+      (**admin only**: requires the `X-Admin-Key` header)
+    """
+    if rebuild:
+        await require_admin(x_admin_key)
+
+    try:
+        job, created = indexing_jobs.start(
+            lambda progress: rag_service.index_book_content_if_needed(progress=progress, force=rebuild)
+        )
+        return {
+            "status": "accepted" if created else "already_running",
+            "message": "Indexing job started" if created else "Joined the indexing job already in progress",
+            "job": job.to_dict()
+        }
+    except Exception as e:
+        logger.error(f"Error starting indexing job: {e}")
+        raise HTTPException(status_code=500, detail="Failed to start indexing job")
+
+@router.get("/index-book/status")
+async def latest_index_job_status():
+    """
+    Return the status of the most recent indexing job.
+    """
+    job = indexing_jobs.latest()
+    if not job:
+        raise HTTPException(status_code=404, detail="No indexing job has been started")
+    return job.to_dict()
+
+@router.get("/index-book/{job_id}")
+async def index_job_status(job_id: str):
+    """
+    Return phase, chunks processed, throughput and errors for an indexing job.
+    """
+    job = indexing_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Indexing job not found")
+    return job.to_dict()
+
+@router.get("/index-versions")
+async def list_index_versions(_: None = Depends(require_admin)):
+    """
+    List the validated index versions and the one currently live.
+
+    **Admin only**: requires the `X-Admin-Key` header.
+    """
+    try:
+        return {
+            "live": indexing_service.get_live_version(),
+            "versions": indexing_service.list_index_versions()
+        }
+    except Exception as e:
+        logger.error(f"Error listing index versions: {e}")
+        raise HTTPException(status_code=500, detail="Failed to list index versions")
+
+@router.post("/index-versions/rollback")
+async def rollback_index_version(_: None = Depends(require_admin)):
+    """
+    Switch the live index back to the previous validated version.
+
+    **Admin only**: requires the `X-Admin-Key` header.
     """
     try:
-        await rag_service.index_book_content_if_needed()
-        return {"status": "success", "message": "Book content indexed successfully"}
+        return {"status": "success", "live": indexing_service.rollback_index()}
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        logger.error(f"Error indexing book: {e}")
-        raise HTTPException(status_code=500, detail="Failed to index book content")
+        logger.error(f"Error rolling back index: {e}")
+        raise HTTPException(status_code=500, detail="Failed to roll back index")
 
 # Additional endpoints for conversation management
 @router.get("/conversations/{user_id}")
@@ -20,7 +20,7 @@ async def get_profile(
 
     Requires authentication.
     """
-    profile = ProfileService.get_profile(db, current_user.id)
+    profile = current_user.profile
 
     if not profile:
         raise HTTPException(
@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import hashlib
+import json
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.core.dependencies import get_current_user
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.core.dependencies import get_current_user, require_admin
 from app.services.translation_service import translation_service
+from app.services.translation_cache import translation_cache, content_hash
+from app.services.translation_memory import translation_memory
+from app.services.provider_gate import provider_metrics
+from app.services.provider_router import provider_router
+from app.services.pretranslation import pretranslation_service
 from app.models import User
-from app.core.config import get_logger
+from app.core.config import get_logger, get_db, TRANSLATION_HTTP_MAX_AGE
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -27,6 +38,7 @@ class TranslateResponse(BaseModel):
     source_language: str
     target_language: str
     cached: bool = False
+    content_hash: Optional[str] = None
 
     class Config:
         json_schema_extra = {
@@ -34,14 +46,16 @@ class TranslateResponse(BaseModel):
                 "translated_text": "# ہفتہ 1: ROS 2 کا تعارف\n\nROS روبوٹ سافٹ ویئر لکھنے کے لیے ایک لچکدار فریم ورک ہے۔",
                 "source_language": "en",
                 "target_language": "ur",
-                "cached": False
+                "cached": False,
+                "content_hash": "9f2c4e0a7b1d3c5e8f6a2b4d1c3e5f7a9b8c6d4e2f0a1b3c5d7e9f8a6b4c2d0e"
             }
         }
 
 @router.post("/translate", response_model=TranslateResponse, tags=["translation"])
 async def translate_content(
     request: TranslateRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     Translate markdown content to target language (Urdu).
@@ -51,13 +65,14 @@ async def translate_content(
     **Request Body**:
     - `text`: Markdown content to translate
     - `target_language`: Target language code (default: "ur" for Urdu)
-    - `source_file`: File path for logging/caching purposes
+    - `source_file`: File path, stored with cached translations for invalidation
 
     **Response**:
     - `translated_text`: Translated markdown content
     - `source_language`: Detected source language
     - `target_language`: Target language
-    - `cached`: Whether result was from cache (future enhancement)
+    - `cached`: Whether the result was served from the translation cache
+    - `content_hash`: SHA-256 of `text`; use it with `GET /translate/chapters/...` for HTTP-cached repeat views
     """
     logger.info(f"Translation request from user {current_user.id} for file {request.source_file}")
 
@@ -74,9 +89,11 @@ async def translate_content(
         )
 
     try:
-        translated_text = await translation_service.translate_text(
+        translated_text, cached = await translation_service.translate_document(
+            db,
             request.text,
-            request.target_language
+            request.target_language,
+            source_file=request.source_file
         )
 
         if not translated_text:
@@ -85,13 +102,14 @@ async def translate_content(
                 detail="Translation failed. Please try again later."
             )
 
-        logger.info(f"Translation completed for user {current_user.id}")
+        logger.info(f"Translation completed for user {current_user.id} (cached: {cached})")
 
         return TranslateResponse(
             translated_text=translated_text,
             source_language="en",
             target_language=request.target_language,
-            cached=False
+            cached=cached,
+            content_hash=content_hash(request.text)
         )
 
     except HTTPException:
@@ -102,3 +120,180 @@ async def translate_content(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred during translation"
         )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+@router.get("/translate/chapters/{target_language}/{chapter_hash}", response_model=TranslateResponse, tags=["translation"])
+async def get_translated_chapter(
+    target_language: str,
+    chapter_hash: str = Path(..., pattern="^[0-9a-f]{64}$", description="content_hash of the source chapter text"),
+    source_file: Optional[str] = Query(None, description="Chapter path, used for logging only"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Fetch a previously translated chapter by content hash, with HTTP caching.
+
+    The URL is content-addressed, so browsers and CDNs can cache it: responses
+    carry a strong `ETag` and a public `Cache-Control`, and `If-None-Match`
+    is answered with `304 Not Modified`. Only cached translations are served
+    (no provider calls), so no authentication is required. A `404` means the
+    chapter has not been translated yet; fall back to `POST /translate`.
+    """
+    translated_text = translation_cache.get(db, chapter_hash, target_language, translation_service.available_providers)
+    if translated_text is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Translation not cached",
+            headers={"Cache-Control": "no-store"}
+        )
+
+    body = TranslateResponse(
+        translated_text=translated_text,
+        source_language="en",
+        target_language=target_language,
+        cached=True,
+        content_hash=chapter_hash
+    ).model_dump_json().encode("utf-8")
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={TRANSLATION_HTTP_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    logger.info(f"Serving cached translation of {source_file or chapter_hash} ({target_language})")
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.post("/translate/stream", tags=["translation"])
+async def translate_content_stream(
+    request: TranslateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Translate markdown content, streaming segments as they are translated.
+
+    **Authentication Required**: Must be logged in with valid JWT token.
+
+    **Request Body**: Same as `POST /translate`.
+
+    **Response**: Newline-delimited JSON (`application/x-ndjson`), one event per line:
+    - `start`: segment counts, including how many are already cached
+    - `segment`: final text of the segment at `index` (structural and cached segments come first)
+    - `delta`: partial text for the segment at `index` while the OpenAI fallback streams tokens
+    - `error`: the segment at `index` could not be translated
+    - `done`: end of stream
+    """
+    logger.info(f"Streaming translation request from user {current_user.id} for file {request.source_file}")
+
+    if not request.text or request.text.strip() == "":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Text cannot be empty"
+        )
+
+    if len(request.text) > 50000:  # Limit to ~50KB
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Text too long (max 50,000 characters)"
+        )
+
+    async def events():
+        async for event in translation_service.translate_document_stream(
+            db,
+            request.text,
+            request.target_language,
+            source_file=request.source_file
+        ):
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.get("/translate/cache/stats", tags=["translation"])
+async def translation_cache_stats(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Translation cache size and hit-rate metrics, plus fuzzy translation memory reuse.
+
+    **Authentication Required**
+    """
+    return {**translation_cache.stats(db), "translation_memory": translation_memory.stats()}
+
+
+@router.delete("/translate/cache", tags=["translation"])
+async def invalidate_translation_cache(
+    source_file: str,
+    _: None = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Drop all cached translations of a source file (e.g. after the chapter was edited).
+
+    **Admin only**: requires the `X-Admin-Key` header.
+    """
+    removed = translation_cache.invalidate_source_file(db, source_file)
+    return {"source_file": source_file, "removed": removed}
+
+
+@router.get("/translate/metrics", tags=["translation"])
+async def translation_provider_metrics(current_user: User = Depends(get_current_user)):
+    """
+    Per-provider queue depth, in-flight calls and rate-limit waits, plus the
+    router's rolling latency/error windows and hedging counters.
+
+    **Authentication Required**
+    """
+    return {**provider_metrics(), "routing": provider_router.metrics()}
+
+
+class PretranslateRequest(BaseModel):
+    languages: Optional[List[str]] = None
+    dry_run: bool = False
+
+
+@router.post("/translate/pretranslate", status_code=status.HTTP_202_ACCEPTED, tags=["translation"])
+async def start_pretranslation(
+    request: PretranslateRequest,
+    _: None = Depends(require_admin)
+):
+    """
+    Pre-translate every chapter into the translation cache in the background.
+
+    **Admin only**: requires the `X-Admin-Key` header.
+
+    Only chapters whose current content is not cached are translated. If a run
+    is already active, its status is returned instead of starting another.
+    """
+    progress, created = pretranslation_service.start(languages=request.languages, dry_run=request.dry_run)
+    return {"created": created, **progress.to_dict()}
+
+
+@router.get("/translate/pretranslate/status", tags=["translation"])
+async def pretranslation_status(_: None = Depends(require_admin)):
+    """
+    Progress and cost estimate of the latest pre-translation run.
+
+    **Admin only**: requires the `X-Admin-Key` header.
+    """
+    progress = pretranslation_service.latest()
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No pre-translation run yet"
+        )
+    return progress.to_dict()
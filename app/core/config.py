@@ -18,6 +18,120 @@ Base = declarative_base()
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production-please-make-it-long-and-random")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_DAYS = int(os.getenv("ACCESS_TOKEN_EXPIRE_DAYS", "7"))
+# Stateless mode: short-lived access tokens are validated without a session lookup,
+# sessions back refresh tokens, and signout revokes the access token's jti
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() == "true"
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+# How often each worker pulls new revocations from the database
+REVOCATION_REFRESH_SECONDS = int(os.getenv("REVOCATION_REFRESH_SECONDS", "5"))
+# bcrypt cost factor; stored hashes with a different cost are rehashed on the next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads hashing/verifying passwords, i.e. the most cores auth can take at once
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+# Validated sessions are cached so authenticated requests skip the database
+SESSION_CACHE_ENABLED = os.getenv("SESSION_CACHE_ENABLED", "true").lower() == "true"
+# Upper bound on how long a signed-out token stays usable on workers that do not share the cache
+SESSION_CACHE_TTL_SECONDS = int(os.getenv("SESSION_CACHE_TTL_SECONDS", "300"))
+SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "10000"))
+# Share the cache (and its invalidations) across workers; requires the redis package
+SESSION_CACHE_REDIS_URL = os.getenv("SESSION_CACHE_REDIS_URL", "")
+# Background removal of expired sessions
+SESSION_SWEEP_ENABLED = os.getenv("SESSION_SWEEP_ENABLED", "true").lower() == "true"
+SESSION_SWEEP_INTERVAL_SECONDS = int(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "3600"))
+SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "1000"))
+# Oldest sessions beyond this many per user are removed by the sweeper (0 = unlimited)
+SESSION_MAX_PER_USER = int(os.getenv("SESSION_MAX_PER_USER", "10"))
+
+# Indexing configuration
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", "384"))
+INDEXING_BATCH_SIZE = int(os.getenv("INDEXING_BATCH_SIZE", "64"))
+# Number of embedding worker processes for full builds (1 = in-process, 0 = one per CPU core)
+INDEXING_WORKERS = int(os.getenv("INDEXING_WORKERS", "1"))
+# Collapse near-duplicate paragraphs (MinHash/LSH over word 3-grams) into one point
+INDEXING_DEDUP_ENABLED = os.getenv("INDEXING_DEDUP_ENABLED", "true").lower() == "true"
+INDEXING_DEDUP_THRESHOLD = float(os.getenv("INDEXING_DEDUP_THRESHOLD", "0.85"))
+# On-disk embedding cache keyed by (model, text hash); set to an empty string to disable
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache.sqlite3")
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+# Name readers query; it is an alias over versioned collections ("<name>_v<timestamp>")
+QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "book_content")
+# Previous index versions kept for instant rollback
+INDEX_VERSIONS_TO_KEEP = int(os.getenv("INDEX_VERSIONS_TO_KEEP", "2"))
+# Sample queries a new index version must answer before it goes live
+INDEX_VALIDATION_QUERIES = [
+    q.strip() for q in os.getenv("INDEX_VALIDATION_QUERIES", "What is ROS 2?;How do humanoid robots balance?").split(";")
+    if q.strip()
+]
+# Serve retrieval from a memory-mapped index snapshot instead of Qdrant (test environments, cold starts)
+INDEX_SNAPSHOT_PATH = os.getenv("INDEX_SNAPSHOT_PATH", "")
+# Docs directory override (defaults to ../../frontend/docs or ../frontend/docs)
+DOCS_PATH = os.getenv("DOCS_PATH", "")
+# Watch the docs directory and re-index changed files (development/staging only)
+DOCS_WATCH_ENABLED = os.getenv("DOCS_WATCH_ENABLED", "false").lower() == "true"
+DOCS_WATCH_DEBOUNCE_MS = int(os.getenv("DOCS_WATCH_DEBOUNCE_MS", "500"))
+
+# Translation cache
+# Bump when the glossary/prompt changes so stale translations are not served
+TRANSLATION_GLOSSARY_VERSION = os.getenv("TRANSLATION_GLOSSARY_VERSION", "2")
+TRANSLATION_CACHE_TTL_DAYS = int(os.getenv("TRANSLATION_CACHE_TTL_DAYS", "30"))
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "20000"))
+# Batched provider calls for long documents
+TRANSLATION_GOOGLE_BATCH_CHARS = int(os.getenv("TRANSLATION_GOOGLE_BATCH_CHARS", "25000"))
+TRANSLATION_OPENAI_BATCH_CHARS = int(os.getenv("TRANSLATION_OPENAI_BATCH_CHARS", "6000"))
+TRANSLATION_GOOGLE_CONCURRENCY = int(os.getenv("TRANSLATION_GOOGLE_CONCURRENCY", "4"))
+TRANSLATION_OPENAI_CONCURRENCY = int(os.getenv("TRANSLATION_OPENAI_CONCURRENCY", "4"))
+# Provider quotas (0 = unlimited) and the thread pool blocking SDK calls run on
+TRANSLATION_GOOGLE_REQUESTS_PER_MINUTE = float(os.getenv("TRANSLATION_GOOGLE_REQUESTS_PER_MINUTE", "600"))
+TRANSLATION_OPENAI_REQUESTS_PER_MINUTE = float(os.getenv("TRANSLATION_OPENAI_REQUESTS_PER_MINUTE", "500"))
+TRANSLATION_EXECUTOR_THREADS = int(os.getenv("TRANSLATION_EXECUTOR_THREADS", "8"))
+
+# Provider routing: rolling health window and hedged requests
+TRANSLATION_ROUTER_WINDOW = int(os.getenv("TRANSLATION_ROUTER_WINDOW", "100"))
+# Start the second provider when the first is slower than its p95 (costs a duplicate call)
+TRANSLATION_HEDGING_ENABLED = os.getenv("TRANSLATION_HEDGING_ENABLED", "false").lower() == "true"
+# Hedge delay until a provider has enough latency samples, and the lower bound afterwards
+TRANSLATION_HEDGE_DEFAULT_DELAY_MS = int(os.getenv("TRANSLATION_HEDGE_DEFAULT_DELAY_MS", "3000"))
+TRANSLATION_HEDGE_MIN_DELAY_MS = int(os.getenv("TRANSLATION_HEDGE_MIN_DELAY_MS", "250"))
+
+# Fuzzy translation memory: reuse translations of near-identical segments
+TRANSLATION_MEMORY_ENABLED = os.getenv("TRANSLATION_MEMORY_ENABLED", "true").lower() == "true"
+# Minimum estimated Jaccard similarity of character 5-grams for reuse as-is;
+# such matches must also have the same words (only whitespace/punctuation may differ)
+TRANSLATION_MEMORY_THRESHOLD = float(os.getenv("TRANSLATION_MEMORY_THRESHOLD", "0.9"))
+# Shorter segments are only reused when they differ in nothing but numbers
+TRANSLATION_MEMORY_MIN_CHARS = int(os.getenv("TRANSLATION_MEMORY_MIN_CHARS", "40"))
+TRANSLATION_MEMORY_MAX_ENTRIES = int(os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", "50000"))
+# Cache-Control max-age (seconds) for content-addressed translated chapters
+TRANSLATION_HTTP_MAX_AGE = int(os.getenv("TRANSLATION_HTTP_MAX_AGE", "86400"))
+
+# Offline pre-translation of the whole book
+# Languages to pre-translate (comma separated; empty = every language the service knows)
+PRETRANSLATION_LANGUAGES = [code.strip() for code in os.getenv("PRETRANSLATION_LANGUAGES", "").split(",") if code.strip()]
+PRETRANSLATION_STATE_PATH = os.getenv("PRETRANSLATION_STATE_PATH", "./pretranslation_state.json")
+# Provider list prices (USD per million source characters), used for cost estimates
+TRANSLATION_GOOGLE_COST_PER_MILLION_CHARS = float(os.getenv("TRANSLATION_GOOGLE_COST_PER_MILLION_CHARS", "20"))
+TRANSLATION_OPENAI_COST_PER_MILLION_CHARS = float(os.getenv("TRANSLATION_OPENAI_COST_PER_MILLION_CHARS", "0.5"))
+
+# Admin endpoints (X-Admin-Key header); empty disables them
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "")
+
+# Rate limiting per authenticated user (else per client IP), with a budget per route group
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# Requests per minute (0 = unlimited) and burst size of each group
+RATE_LIMIT_CHAT_PER_MINUTE = float(os.getenv("RATE_LIMIT_CHAT_PER_MINUTE", "10"))
+RATE_LIMIT_CHAT_BURST = int(os.getenv("RATE_LIMIT_CHAT_BURST", "5"))
+RATE_LIMIT_TRANSLATE_PER_MINUTE = float(os.getenv("RATE_LIMIT_TRANSLATE_PER_MINUTE", "10"))
+RATE_LIMIT_TRANSLATE_BURST = int(os.getenv("RATE_LIMIT_TRANSLATE_BURST", "5"))
+RATE_LIMIT_AUTH_PER_MINUTE = float(os.getenv("RATE_LIMIT_AUTH_PER_MINUTE", "10"))
+RATE_LIMIT_AUTH_BURST = int(os.getenv("RATE_LIMIT_AUTH_BURST", "10"))
+RATE_LIMIT_DEFAULT_PER_MINUTE = float(os.getenv("RATE_LIMIT_DEFAULT_PER_MINUTE", "120"))
+RATE_LIMIT_DEFAULT_BURST = int(os.getenv("RATE_LIMIT_DEFAULT_BURST", "60"))
+# Share buckets across workers; requires the redis package
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Key anonymous callers by X-Forwarded-For (only behind a proxy that sets it)
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
 
 # Configure basic logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
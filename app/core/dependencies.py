@@ -1,12 +1,17 @@
-from fastapi import Depends, HTTPException, status
+import secrets
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
 
-from app.core.config import get_db
+from app.core.config import get_db, ADMIN_API_KEY, AUTH_STATELESS
 from app.core.security import decode_access_token
-from app.models import User, Session as SessionModel
+from app.core.session_cache import session_cache
+from app.models import User
+from app.services.auth_service import AuthService
+from app.services.token_revocation import revocation_list
 
 security = HTTPBearer()
 
@@ -18,6 +23,10 @@ async def get_current_user(
     """
     Dependency to get the current authenticated user.
 
+    Validated sessions are served from the session cache; on a miss the
+    session, user and profile are loaded in one joined query and cached.
+    The returned user's ``profile`` is loaded either way.
+
     Raises:
         HTTPException: If token is invalid or expired
 
@@ -43,11 +52,16 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Check session in database
-    session = db.query(SessionModel).filter(
-        SessionModel.token == token,
-        SessionModel.user_id == user_id
-    ).first()
+    if AUTH_STATELESS:
+        return _get_stateless_user(db, token, payload, user_id)
+
+    # Only active users with a live session are cached
+    user = session_cache.get(token)
+    if user is not None and str(user.id) == user_id:
+        return user
+
+    # Session, user and profile in one round trip
+    session = AuthService.resolve_session(db, token, user_id)
 
     if not session:
         raise HTTPException(
@@ -65,8 +79,37 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get user
-    user = db.query(User).filter(User.id == user_id).first()
+    user = session.user
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+
+    session_cache.put(token, user, user.profile, session.expires_at)
+    return user
+
+
+def _get_stateless_user(db: Session, token: str, payload: dict, user_id: str) -> User:
+    """
+    Resolve the caller from a short-lived access token without a session lookup.
+
+    The signature and expiry were already checked; the jti is checked against
+    the in-memory revocation list. The user comes from the session cache,
+    where the token was put when it was issued, and is loaded only on a miss.
+    """
+    if payload.get("type") != "access" or revocation_list.is_revoked(payload.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or revoked access token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user = session_cache.get(token)
+    if user is not None and str(user.id) == user_id:
+        return user
+
+    user = AuthService.load_user(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -80,6 +123,7 @@ async def get_current_user(
             detail="User account is inactive"
         )
 
+    session_cache.put(token, user, user.profile, datetime.utcfromtimestamp(payload["exp"]))
     return user
 
 
@@ -98,3 +142,23 @@ async def get_current_user_optional(
         return await get_current_user(credentials, db)
     except HTTPException:
         return None
+
+
+async def require_admin(x_admin_key: Optional[str] = Header(None)) -> None:
+    """
+    Dependency guarding admin endpoints with the X-Admin-Key header.
+
+    Raises:
+        HTTPException: If admin endpoints are disabled or the key does not match
+    """
+    if not ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled"
+        )
+
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, ADMIN_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin key"
+        )
@@ -0,0 +1,243 @@
+"""
+Per-user / per-IP token-bucket rate limiting for the API.
+
+Requests are keyed by the authenticated user id (read from the bearer
+token's signed ``sub`` claim, without a database lookup) or, for anonymous
+callers, by client IP. Each route group has its own budget, so a flood of
+chat requests does not eat into translation or sign-in capacity. Over-budget
+requests get ``429 Too Many Requests`` with ``Retry-After``.
+
+Buckets live in process memory by default. Set RATE_LIMIT_REDIS_URL to
+share them across workers; if Redis is unreachable, requests are allowed.
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from app.core.config import (
+    get_logger, RATE_LIMIT_ENABLED, RATE_LIMIT_REDIS_URL, RATE_LIMIT_MAX_KEYS, RATE_LIMIT_TRUST_FORWARDED,
+    RATE_LIMIT_CHAT_PER_MINUTE, RATE_LIMIT_CHAT_BURST, RATE_LIMIT_TRANSLATE_PER_MINUTE, RATE_LIMIT_TRANSLATE_BURST,
+    RATE_LIMIT_AUTH_PER_MINUTE, RATE_LIMIT_AUTH_BURST, RATE_LIMIT_DEFAULT_PER_MINUTE, RATE_LIMIT_DEFAULT_BURST
+)
+from app.core.security import decode_access_token
+
+logger = get_logger(__name__)
+
+# (group, methods, path prefixes); the first match wins, other /api routes use "default"
+ROUTE_GROUPS = [
+    ("chat", {"POST"}, ("/api/chat",)),
+    ("translate", {"POST"}, ("/api/translate",)),
+    ("auth", {"POST"}, ("/api/auth/signup", "/api/auth/signin", "/api/auth/refresh")),
+]
+
+# Group -> (requests per minute, burst capacity); 0 requests per minute disables the limit
+GROUP_LIMITS: Dict[str, Tuple[float, int]] = {
+    "chat": (RATE_LIMIT_CHAT_PER_MINUTE, RATE_LIMIT_CHAT_BURST),
+    "translate": (RATE_LIMIT_TRANSLATE_PER_MINUTE, RATE_LIMIT_TRANSLATE_BURST),
+    "auth": (RATE_LIMIT_AUTH_PER_MINUTE, RATE_LIMIT_AUTH_BURST),
+    "default": (RATE_LIMIT_DEFAULT_PER_MINUTE, RATE_LIMIT_DEFAULT_BURST),
+}
+
+
+def route_group(method: str, path: str) -> Optional[str]:
+    """Rate-limit group of a request, or None for unlimited paths (outside /api)."""
+    if not path.startswith("/api/"):
+        return None
+    for group, methods, prefixes in ROUTE_GROUPS:
+        if method in methods and path.startswith(prefixes):
+            return group
+    return "default"
+
+
+class MemoryRateLimitBackend:
+    """Per-process token buckets, least recently used evicted beyond max_keys."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, updated)
+
+    async def acquire(self, key: str, rate: float, capacity: int) -> float:
+        """
+        Take one token from a bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Bucket size (burst)
+
+        Returns:
+            0 if the request is allowed, else seconds until a token is available
+        """
+        # No awaits below, so concurrent requests on the event loop cannot interleave
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(capacity), now))
+        tokens = min(float(capacity), tokens + (now - updated) * rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def size(self) -> Optional[int]:
+        return len(self._buckets)
+
+
+# Refill and take atomically, on the Redis server's clock
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitBackend:
+    """Token buckets shared by every worker."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._script = self._redis.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def acquire(self, key: str, rate: float, capacity: int) -> float:
+        return float(await self._script(keys=[f"ratelimit:{key}"], args=[rate, capacity]))
+
+    def size(self) -> Optional[int]:
+        return None  # Not tracked for the shared backend
+
+
+class RateLimiter:
+    """Applies the group budgets and keeps per-group counters."""
+
+    def __init__(self, backend, limits: Dict[str, Tuple[float, int]] = GROUP_LIMITS):
+        self.backend = backend
+        self.limits = limits
+        self.allowed: Dict[str, int] = {group: 0 for group in limits}
+        self.limited: Dict[str, int] = {group: 0 for group in limits}
+        self.backend_errors = 0
+
+    async def check(self, group: str, key: str) -> float:
+        """
+        Count a request against its group budget.
+
+        Returns:
+            0 if the request may proceed, else seconds the caller should wait
+        """
+        per_minute, burst = self.limits[group]
+        if per_minute <= 0:
+            return 0.0
+        try:
+            retry_after = await self.backend.acquire(f"{group}:{key}", per_minute / 60, max(1, burst))
+        except Exception as e:
+            # Fail open: a broken shared backend must not take the API down
+            self.backend_errors += 1
+            logger.warning(f"Rate limit backend error, allowing request: {e}")
+            retry_after = 0.0
+
+        if retry_after > 0:
+            self.limited[group] += 1
+        else:
+            self.allowed[group] += 1
+        return retry_after
+
+    def metrics(self) -> Dict:
+        return {
+            "enabled": RATE_LIMIT_ENABLED,
+            "backend": "redis" if isinstance(self.backend, RedisRateLimitBackend) else "memory",
+            "tracked_keys": self.backend.size(),
+            "backend_errors": self.backend_errors,
+            "groups": {
+                group: {
+                    "requests_per_minute": per_minute,
+                    "burst": burst,
+                    "allowed": self.allowed[group],
+                    "limited": self.limited[group],
+                }
+                for group, (per_minute, burst) in self.limits.items()
+            },
+        }
+
+
+def _client_key(scope: Dict) -> str:
+    headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+
+    authorization = headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        payload = decode_access_token(authorization[7:].strip())
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+
+    if RATE_LIMIT_TRUST_FORWARDED and headers.get("x-forwarded-for"):
+        return f"ip:{headers['x-forwarded-for'].split(',')[0].strip()}"
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing the rate limits.
+
+    Written as plain ASGI (not BaseHTTPMiddleware) so streaming responses
+    pass through untouched. Add it before CORSMiddleware, so CORS stays the
+    outermost layer and 429 responses carry CORS headers.
+    """
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        group = route_group(scope["method"], scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = await self.limiter.check(group, _client_key(scope))
+        if retry_after > 0:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests, please retry later"},
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+def _make_backend():
+    if RATE_LIMIT_REDIS_URL:
+        try:
+            return RedisRateLimitBackend(RATE_LIMIT_REDIS_URL)
+        except ImportError:
+            logger.warning("RATE_LIMIT_REDIS_URL is set but the redis package is not installed; "
+                           "using per-process rate limits.")
+    return MemoryRateLimitBackend()
+
+
+# Singleton limiter shared by the middleware and the metrics endpoint
+rate_limiter = RateLimiter(_make_backend())
@@ -1,11 +1,26 @@
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional, Dict
-from app.core.config import SECRET_KEY, ALGORITHM
+from typing import Optional, Dict, Tuple
+from uuid import uuid4
+from app.core.config import SECRET_KEY, ALGORITHM, BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing. Pinning min/max rounds to the configured cost makes
+# hashes made with any other cost "need update", so they are rehashed on login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a small pool keeps hashing off the event loop
+# while bounding how many cores a signup burst can take
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
 
 
 def hash_password(password: str) -> str:
@@ -18,10 +33,37 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, pwd_context.hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the password worker pool, rehashing it if needed.
+
+    Returns:
+        Tuple of (valid, new hash if the stored one uses an outdated cost, else None)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+def hash_token(token: str) -> str:
+    """SHA-256 hex digest of a bearer token, as stored in sessions.token_hash."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
 
+    Every token gets a unique ``jti`` claim (unless one is given), which
+    keeps tokens issued in the same second distinct and lets them be revoked.
+
     Args:
         data: Dictionary containing claims (e.g., {"sub": user_id})
         expires_delta: Optional expiration time delta
@@ -37,6 +79,7 @@ def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(days=7)  # Default 7 days
 
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid4().hex)
 
     encoded_jwt = jwt.encode(
         to_encode,
@@ -0,0 +1,245 @@
+"""
+Cache of validated sessions, so authenticated requests skip the database.
+
+Entries are keyed by the SHA-256 of the bearer token and hold an allow-listed
+column snapshot of the user and their profile (no password hash). On a hit, detached User/UserProfile
+objects are rebuilt from the snapshot; ``user.profile`` is already loaded, so
+reading it never touches the database.
+
+The default backend is per process. With several workers, set
+SESSION_CACHE_REDIS_URL so signout and profile updates invalidate every
+worker's entries; otherwise other workers may accept a signed-out token
+until its entry expires (SESSION_CACHE_TTL_SECONDS).
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import DateTime
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import (
+    get_logger, SESSION_CACHE_ENABLED, SESSION_CACHE_TTL_SECONDS,
+    SESSION_CACHE_MAX_ENTRIES, SESSION_CACHE_REDIS_URL
+)
+from app.core.security import hash_token
+from app.models import User, UserProfile
+
+logger = get_logger(__name__)
+
+
+class MemorySessionBackend:
+    """Per-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = SESSION_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, user_id, snapshot)
+        self._by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key: str, user_id: str, snapshot: Dict, ttl: float) -> None:
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, user_id, snapshot)
+            self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def delete_user(self, user_id: str) -> None:
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[1]]
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisSessionBackend:
+    """Shared backend, so invalidation reaches every worker."""
+
+    def __init__(self, url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = self._redis.get(f"session:{key}")
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, user_id: str, snapshot: Dict, ttl: float) -> None:
+        ttl_ms = max(1, int(ttl * 1000))
+        index_key = f"session_user:{user_id}"
+        pipe = self._redis.pipeline()
+        pipe.set(f"session:{key}", json.dumps(snapshot, default=str), px=ttl_ms)
+        pipe.sadd(index_key, key)
+        pipe.pexpire(index_key, int(SESSION_CACHE_TTL_SECONDS * 1000))
+        pipe.execute()
+
+    def delete(self, key: str) -> None:
+        self._redis.delete(f"session:{key}")
+
+    def delete_user(self, user_id: str) -> None:
+        index_key = f"session_user:{user_id}"
+        keys = [key.decode() if isinstance(key, bytes) else key for key in self._redis.smembers(index_key)]
+        self._redis.delete(index_key, *(f"session:{key}" for key in keys))
+
+    def size(self) -> Optional[int]:
+        return None  # Not tracked for the shared backend
+
+
+# Only what the auth dependencies and endpoints read from current_user is
+# cached; credentials such as hashed_password never leave the database
+USER_FIELDS = ("id", "email", "is_active", "is_verified", "created_at")
+PROFILE_FIELDS = (
+    "id", "user_id", "programming_experience", "python_proficiency", "ros_experience", "ai_ml_experience",
+    "robotics_hardware_experience", "sensor_integration", "electronics_knowledge", "primary_interests",
+    "time_commitment", "created_at", "updated_at",
+)
+
+
+def _snapshot(obj, fields) -> Dict:
+    return {name: getattr(obj, name) for name in fields}
+
+
+def _rebuild(model, data: Dict, fields):
+    """
+    Detached instance from a snapshot, parsing values the Redis backend serialized as strings.
+
+    Columns outside ``fields`` stay unloaded, so reading them from the
+    detached instance raises instead of returning a stale or missing value.
+    """
+    columns = model.__table__.columns
+    values = {}
+    for name in fields:
+        value = data.get(name)
+        if isinstance(value, str):
+            column_type = columns[name].type
+            if isinstance(column_type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif getattr(column_type, "as_uuid", False):
+                value = UUID(value)
+        values[name] = value
+    return model(**values)
+
+
+class SessionCache:
+    """TTL cache of (token hash -> user and profile) for validated sessions."""
+
+    def __init__(self, backend, ttl_seconds: int = SESSION_CACHE_TTL_SECONDS, enabled: bool = SESSION_CACHE_ENABLED):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[User]:
+        """
+        Cached user for a token, with ``profile`` loaded.
+
+        Returns:
+            Detached User, or None on a miss or an expired session
+        """
+        if not self.enabled:
+            return None
+        try:
+            data = self.backend.get(hash_token(token))
+        except Exception as e:
+            logger.warning(f"Session cache lookup failed: {e}")
+            data = None
+        if data is None or datetime.fromisoformat(str(data["session_expires_at"])) <= datetime.utcnow():
+            self.misses += 1
+            return None
+        self.hits += 1
+
+        user = _rebuild(User, data["user"], USER_FIELDS)
+        user.profile = _rebuild(UserProfile, data["profile"], PROFILE_FIELDS) if data["profile"] else None
+        make_transient_to_detached(user)
+        if user.profile is not None:
+            make_transient_to_detached(user.profile)
+        return user
+
+    def put(self, token: str, user: User, profile: Optional[UserProfile], session_expires_at: datetime) -> None:
+        """Cache a validated session until the TTL or the session's own expiry, whichever is sooner."""
+        if not self.enabled:
+            return
+        ttl = min(self.ttl_seconds, (session_expires_at - datetime.utcnow()).total_seconds())
+        if ttl <= 0:
+            return
+        snapshot = {
+            "user": _snapshot(user, USER_FIELDS),
+            "profile": _snapshot(profile, PROFILE_FIELDS) if profile is not None else None,
+            "session_expires_at": session_expires_at.isoformat(),
+        }
+        try:
+            self.backend.set(hash_token(token), str(user.id), snapshot, ttl)
+        except Exception as e:
+            logger.warning(f"Session cache write failed: {e}")
+
+    def invalidate_token(self, token: str) -> None:
+        self._invalidate(self.backend.delete, hash_token(token))
+
+    def invalidate_user(self, user_id) -> None:
+        """Drop every cached session of a user, e.g. after their profile changed."""
+        self._invalidate(self.backend.delete_user, str(user_id))
+
+    def _invalidate(self, delete, key: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            delete(key)
+        except Exception as e:
+            logger.error(f"Session cache invalidation failed: {e}")
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": "redis" if isinstance(self.backend, RedisSessionBackend) else "memory",
+            "entries": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _make_backend():
+    if SESSION_CACHE_REDIS_URL:
+        try:
+            return RedisSessionBackend(SESSION_CACHE_REDIS_URL)
+        except ImportError:
+            logger.warning("SESSION_CACHE_REDIS_URL is set but the redis package is not installed; "
+                           "using the per-process session cache.")
+    return MemorySessionBackend()
+
+
+# Singleton cache shared by the auth dependencies
+session_cache = SessionCache(_make_backend())
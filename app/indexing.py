@@ -0,0 +1,191 @@
+"""
+Offline indexing command line.
+
+Usage:
+    python -m app.indexing build [--mode full|incremental] [--docs-path PATH] [--collection NAME [--force]]
+                                 [--batch-size N] [--workers N] [--dry-run] [--report report.json]
+    python -m app.indexing export book.bkidx [--collection NAME]
+    python -m app.indexing import book.bkidx
+    python -m app.indexing info book.bkidx
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import QDRANT_COLLECTION, INDEXING_DEDUP_ENABLED, INDEXING_DEDUP_THRESHOLD
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process or any worker process, in MiB."""
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and KiB on Linux
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(max(own, children) / scale, 1)
+
+
+def _clear_collection(client, collection: str, version_prefix: str, force: bool = False) -> None:
+    """
+    Drop an existing collection so a full build does not append duplicate points to it.
+
+    Aliases and collections an alias points to (the live or a validated
+    version) are refused. Other versioned collection names need force.
+    """
+    for alias in client.get_aliases().aliases:
+        if alias.alias_name == collection:
+            raise ValueError(f"'{collection}' is an alias; omit --collection to publish a new index version")
+        if alias.collection_name == collection:
+            raise ValueError(f"'{collection}' is a published index version (alias '{alias.alias_name}'); "
+                             f"omit --collection to publish a new one")
+    if collection.startswith(version_prefix) and not force:
+        raise ValueError(f"'{collection}' looks like an index version; pass --force to overwrite it")
+    if collection in {c.name for c in client.get_collections().collections}:
+        client.delete_collection(collection_name=collection)
+
+
+def _build(args) -> None:
+    from app.services.indexing_service import indexing_service
+    from app.services.indexing_jobs import IndexingProgress
+    from app.services.chunk_dedup import collapse_near_duplicates
+
+    if args.batch_size:
+        indexing_service.batch_size = args.batch_size
+    if args.workers is not None:
+        indexing_service.workers = args.workers
+
+    collection = args.collection or QDRANT_COLLECTION
+    report = {
+        "started_at": datetime.utcnow().isoformat(),
+        "mode": args.mode,
+        "dry_run": args.dry_run,
+        "docs_path": args.docs_path,
+        "collection": collection,
+        "batch_size": indexing_service.batch_size,
+        "workers": indexing_service.workers,
+    }
+
+    progress = IndexingProgress()
+    progress.mark_running()
+    try:
+        if args.dry_run:
+            chunks = indexing_service.extract_book_content(args.docs_path, progress=progress)
+            progress.set_total(len(chunks))
+            progress.tokens = indexing_service.count_tokens([chunk['content'] for chunk in chunks])
+            if INDEXING_DEDUP_ENABLED:
+                report["chunks_after_dedup"] = len(collapse_near_duplicates(chunks, INDEXING_DEDUP_THRESHOLD))
+        elif args.mode == "incremental":
+            report.update(indexing_service.incremental_update(args.docs_path, collection, progress=progress))
+            if progress.errors:
+                # Per-file failures are recorded without raising; the run is still incomplete
+                raise RuntimeError(f"{len(progress.errors)} error(s) while re-indexing changed files")
+        elif args.collection:
+            # Explicit collection: rebuild it in place, without versioning
+            _clear_collection(indexing_service.qdrant_client, collection,
+                              indexing_service._version_prefix(), force=args.force)
+            asyncio.run(indexing_service.index_book_content(collection, progress=progress, docs_path=args.docs_path))
+        else:
+            report["live_version"] = asyncio.run(indexing_service.rebuild_index(progress=progress, docs_path=args.docs_path))
+        progress.mark_finished()
+    except Exception as e:
+        progress.mark_finished(error=str(e))
+
+    report.update({
+        "status": progress.status,
+        "files_scanned": progress.files_scanned,
+        "chunks": progress.chunks_total,
+        "tokens": progress.tokens,
+        "points_uploaded": progress.points_uploaded,
+        "embedding_cache_hits": progress.cache_hits,
+        "embed_seconds": round(progress.embed_seconds, 3),
+        "upload_seconds": round(progress.upload_seconds, 3),
+        "total_seconds": round(progress.elapsed_seconds, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+        "errors": progress.errors,
+    })
+
+    output = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"[OK] Report written to {args.report}" if progress.status == "completed" else f"[ERROR] Indexing failed; report written to {args.report}")
+    else:
+        print(output)
+
+    if progress.status != "completed":
+        sys.exit(1)
+
+
+def _export(args) -> None:
+    from app.services.index_snapshot import export_snapshot
+
+    manifest = export_snapshot(args.path, args.collection)
+    print(f"[OK] Exported {manifest['count']} vectors to {args.path}")
+
+
+def _import(args) -> None:
+    from app.services.index_snapshot import import_snapshot
+
+    version = asyncio.run(import_snapshot(args.path))
+    print(f"[OK] Imported {args.path}; live version is {version}")
+
+
+def _info(args) -> None:
+    from app.services.index_snapshot import read_manifest
+
+    manifest, _ = read_manifest(args.path)
+    manifest["content_hashes"] = f"{len(manifest['content_hashes'])} files"
+    print(json.dumps(manifest, indent=2))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.indexing", description="Offline indexing tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="Index the docs tree and write a JSON performance report")
+    build_cmd.add_argument("--mode", choices=["full", "incremental"], default="full",
+                           help="full: build and publish a new index version; incremental: re-index changed files only")
+    build_cmd.add_argument("--docs-path", default=None, help="Docs directory (defaults to DOCS_PATH / frontend/docs)")
+    build_cmd.add_argument("--collection", default=None,
+                           help="Rebuild this collection in place instead of a new version behind the live alias")
+    build_cmd.add_argument("--force", action="store_true",
+                           help="Allow --collection to overwrite an unpublished versioned collection")
+    build_cmd.add_argument("--batch-size", type=int, default=None, help="Chunks per embedding/upload batch")
+    build_cmd.add_argument("--workers", type=int, default=None, help="Embedding worker processes (0 = one per core)")
+    build_cmd.add_argument("--dry-run", action="store_true", help="Scan and chunk only; no embedding or upload")
+    build_cmd.add_argument("--report", default=None, help="Write the JSON report to this file instead of stdout")
+    build_cmd.set_defaults(handler=_build)
+
+    export_cmd = commands.add_parser("export", help="Export a collection to a snapshot file")
+    export_cmd.add_argument("path", help="Snapshot file to write")
+    export_cmd.add_argument("--collection", default=QDRANT_COLLECTION, help="Collection or alias to export")
+    export_cmd.set_defaults(handler=_export)
+
+    import_cmd = commands.add_parser("import", help="Load a snapshot into a new live index version")
+    import_cmd.add_argument("path", help="Snapshot file to load")
+    import_cmd.set_defaults(handler=_import)
+
+    info_cmd = commands.add_parser("info", help="Print a snapshot's manifest")
+    info_cmd.add_argument("path", help="Snapshot file to inspect")
+    info_cmd.set_defaults(handler=_info)
+
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,21 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware # Import CORSMiddleware
 from app.api import chat, auth, profile, translate
-from app.core.config import get_logger
+from app.core.config import get_logger, DOCS_WATCH_ENABLED, SESSION_SWEEP_ENABLED, AUTH_STATELESS
+from app.core.dependencies import require_admin
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
 
 
 logger = get_logger(__name__)
 
 app = FastAPI(title="Physical AI Textbook API")
 
+# Rate limiting; added before CORS so CORS stays outermost and 429s carry CORS headers
+app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 origins = [
     "http://localhost:3000",  # Docusaurus dev server
@@ -41,11 +46,40 @@ app.include_router(profile.router, prefix="/api")
 app.include_router(chat.router, prefix="/api", tags=["chat"])
 app.include_router(translate.router, prefix="/api", tags=["translation"])
 
+@app.on_event("startup")
+async def start_background_services():
+    if DOCS_WATCH_ENABLED:
+        from app.services.docs_watcher import docs_watcher
+        docs_watcher.start()
+    if SESSION_SWEEP_ENABLED:
+        from app.services.session_sweeper import session_sweeper
+        session_sweeper.start()
+    if AUTH_STATELESS:
+        from app.services.token_revocation import revocation_list
+        await revocation_list.start()
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    if DOCS_WATCH_ENABLED:
+        from app.services.docs_watcher import docs_watcher
+        await docs_watcher.stop()
+    if SESSION_SWEEP_ENABLED:
+        from app.services.session_sweeper import session_sweeper
+        await session_sweeper.stop()
+    if AUTH_STATELESS:
+        from app.services.token_revocation import revocation_list
+        await revocation_list.stop()
+
 @app.get("/")
 async def read_root():
     logger.info("Root endpoint accessed.")
     return {"message": "Welcome to the Interactive Textbook Backend!"}
 
+@app.get("/api/rate-limit/metrics")
+async def rate_limit_metrics(_: None = Depends(require_admin)):
+    """Allowed and rejected requests per rate-limit group (admin only, X-Admin-Key header)."""
+    return rate_limiter.metrics()
+
 @app.get("/health")
 async def health_check():
     logger.info("Health check endpoint accessed.")
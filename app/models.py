@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, String, UUID as SQL_UUID, JSON, DateTime, Integer, Text, ForeignKey
+from sqlalchemy import create_engine, Column, String, UUID as SQL_UUID, JSON, DateTime, Integer, Text, LargeBinary, ForeignKey, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -67,7 +67,7 @@ class Session(Base):
 
     id = Column(SQL_UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(SQL_UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
-    token = Column(String(500), unique=True, nullable=False)
+    token_hash = Column(String(64), unique=True, nullable=False)  # SHA-256 of the bearer token; the token itself is not stored
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     ip_address = Column(String(50), nullable=True)
@@ -107,6 +107,59 @@ class Message(Base):
 
     conversation = relationship("Conversation", back_populates="messages")
 
+class TranslationCacheEntry(Base):
+    __tablename__ = 'translation_cache'
+    __table_args__ = (
+        UniqueConstraint('content_hash', 'target_language', 'provider', 'glossary_version',
+                         name='uq_translation_cache_key'),
+    )
+
+    id = Column(SQL_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    content_hash = Column(String(64), nullable=False)  # SHA-256 of the source text
+    target_language = Column(String(10), nullable=False)
+    provider = Column(String(20), nullable=False)  # 'google' or 'openai'
+    glossary_version = Column(String(50), nullable=False)
+    source_file = Column(String(500), nullable=True)  # For invalidation when a chapter changes
+    translated_text = Column(Text, nullable=False)
+    char_count = Column(Integer, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<TranslationCacheEntry(source_file='{self.source_file}', target_language='{self.target_language}')>"
+
+class TranslationMemoryEntry(Base):
+    __tablename__ = 'translation_memory'
+    __table_args__ = (
+        UniqueConstraint('source_hash', 'target_language', 'provider', 'glossary_version',
+                         name='uq_translation_memory_key'),
+    )
+
+    id = Column(SQL_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    source_hash = Column(String(64), nullable=False)  # SHA-256 of the source segment
+    source_text = Column(Text, nullable=False)
+    target_language = Column(String(10), nullable=False)
+    provider = Column(String(20), nullable=False)
+    glossary_version = Column(String(50), nullable=False)
+    translated_text = Column(Text, nullable=False)
+    signature = Column(LargeBinary, nullable=False)  # MinHash of the source's character n-grams
+    reuse_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<TranslationMemoryEntry(target_language='{self.target_language}', provider='{self.provider}')>"
+
+class RevokedToken(Base):
+    __tablename__ = 'revoked_tokens'
+
+    jti = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime, nullable=False)  # Expiry of the revoked token; the row is useless afterwards
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<RevokedToken(jti='{self.jti}', expires_at='{self.expires_at}')>"
+
 # Pydantic models for API request/response validation
 class UserProfileBase(BaseModel):
     email: EmailStr
@@ -0,0 +1,61 @@
+"""
+Offline whole-book pre-translation.
+
+Usage:
+    python -m app.pretranslate [--languages ur,ar] [--docs-path PATH] [--state FILE] [--dry-run] [--report report.json]
+
+Only chapters whose current content is not yet in the translation cache are
+translated, so the command can be re-run after edits or an interrupted run.
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import argparse
+import asyncio
+import json
+import sys
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.pretranslate",
+                                     description="Pre-translate every chapter into the translation cache.")
+    parser.add_argument("--languages", default=None,
+                        help="Comma-separated language codes (defaults to PRETRANSLATION_LANGUAGES, then ur,ar,hi,es,fr)")
+    parser.add_argument("--docs-path", default=None, help="Docs directory (defaults to DOCS_PATH / frontend/docs)")
+    parser.add_argument("--state", default=None, help="Progress state file (defaults to PRETRANSLATION_STATE_PATH)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be translated and the estimated cost")
+    parser.add_argument("--report", default=None, help="Write the JSON report to this file instead of stdout")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+
+    from app.core.config import SessionLocal
+    from app.services.pretranslation import pretranslation_service
+
+    if args.state:
+        pretranslation_service.state_path = args.state
+    languages = [code.strip() for code in args.languages.split(",") if code.strip()] if args.languages else None
+
+    db = SessionLocal()
+    try:
+        progress = asyncio.run(pretranslation_service.run(db, args.docs_path, languages, dry_run=args.dry_run))
+    finally:
+        db.close()
+
+    output = json.dumps(progress.to_dict(), indent=2, default=str)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"[OK] Report written to {args.report}" if progress.status == "completed" else f"[ERROR] Pre-translation failed; report written to {args.report}")
+    else:
+        print(output)
+
+    if progress.status != "completed":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -73,6 +73,7 @@ class SignupResponse(BaseModel):
     profile: Optional[ProfileResponse]
     token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None  # Only issued when AUTH_STATELESS is enabled
 
 
 # Signin schemas
@@ -86,6 +87,17 @@ class SigninResponse(BaseModel):
     profile: Optional[ProfileResponse]
     token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None  # Only issued when AUTH_STATELESS is enabled
+
+
+# Refresh schemas (stateless mode)
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class RefreshResponse(BaseModel):
+    token: str
+    token_type: str = "bearer"
 
 
 # Session schema
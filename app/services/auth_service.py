@@ -1,19 +1,23 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta
 from typing import Tuple, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from app.models import User, Session as SessionModel
-from app.core.security import hash_password, verify_password, create_access_token
-from app.core.config import ACCESS_TOKEN_EXPIRE_DAYS
+from app.core.security import (
+    hash_password_async, verify_and_update_password, create_access_token, decode_access_token, hash_token
+)
+from app.core.config import ACCESS_TOKEN_EXPIRE_DAYS, ACCESS_TOKEN_EXPIRE_MINUTES, AUTH_STATELESS
+from app.core.session_cache import session_cache
+from app.services.token_revocation import revocation_list
 
 
 class AuthService:
     """Service for authentication operations."""
 
     @staticmethod
-    def signup(db: Session, email: str, password: str) -> Tuple[User, str]:
+    async def signup(db: Session, email: str, password: str) -> Tuple[User, str, Optional[str]]:
         """
         Create a new user account.
 
@@ -23,7 +27,8 @@ class AuthService:
             password: Plain text password
 
         Returns:
-            Tuple of (User, access_token)
+            Tuple of (User, access_token, refresh_token); the refresh token is
+            only issued in stateless mode
 
         Raises:
             HTTPException: If email already exists
@@ -37,7 +42,7 @@ class AuthService:
             )
 
         # Create user
-        hashed_password = hash_password(password)
+        hashed_password = await hash_password_async(password)
         user = User(
             email=email,
             hashed_password=hashed_password,
@@ -49,13 +54,13 @@ class AuthService:
         db.commit()
         db.refresh(user)
 
-        # Create session and token
-        token = AuthService._create_session(db, user)
+        # Create session and tokens
+        token, refresh_token = AuthService._create_session(db, user)
 
-        return user, token
+        return user, token, refresh_token
 
     @staticmethod
-    def signin(db: Session, email: str, password: str) -> Tuple[User, str]:
+    async def signin(db: Session, email: str, password: str) -> Tuple[User, str, Optional[str]]:
         """
         Sign in an existing user.
 
@@ -65,7 +70,8 @@ class AuthService:
             password: Plain text password
 
         Returns:
-            Tuple of (User, access_token)
+            Tuple of (User, access_token, refresh_token); the refresh token is
+            only issued in stateless mode
 
         Raises:
             HTTPException: If credentials are invalid
@@ -79,7 +85,8 @@ class AuthService:
             )
 
         # Verify password
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
@@ -92,35 +99,154 @@ class AuthService:
                 detail="Account is inactive"
             )
 
+        # Upgrade hashes made with a different bcrypt cost
+        if new_hash:
+            user.hashed_password = new_hash
+
         # Update last login
         user.last_login = datetime.utcnow()
         db.commit()
 
-        # Create session and token
-        token = AuthService._create_session(db, user)
+        # Create session and tokens
+        token, refresh_token = AuthService._create_session(db, user)
 
-        return user, token
+        return user, token, refresh_token
+
+    @staticmethod
+    def refresh(db: Session, refresh_token: str) -> str:
+        """
+        Issue a new short-lived access token for a refresh token (stateless mode).
+
+        Args:
+            db: Database session
+            refresh_token: Refresh token returned by signup/signin
+
+        Returns:
+            New access token
+
+        Raises:
+            HTTPException: If the refresh token is invalid, its session is gone or expired,
+                or the account is inactive
+        """
+        payload = decode_access_token(refresh_token)
+        if payload is None or payload.get("type") != "refresh" or payload.get("sub") is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token"
+            )
+
+        session = AuthService.resolve_session(db, refresh_token, payload["sub"])
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Session not found"
+            )
+
+        if session.is_expired():
+            db.delete(session)
+            db.commit()
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Session expired"
+            )
+
+        if not session.user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Account is inactive"
+            )
+
+        return AuthService._issue_access_token(session.user, session.id)
 
     @staticmethod
     def signout(db: Session, token: str) -> None:
         """
         Sign out a user by invalidating their session.
 
+        In stateless mode the access token's jti is revoked as well, and the
+        session is found through the token's ``sid`` claim.
+
         Args:
             db: Database session
             token: JWT token
         """
-        session = db.query(SessionModel).filter(SessionModel.token == token).first()
+        if AUTH_STATELESS:
+            payload = decode_access_token(token) or {}
+            if payload.get("jti") and payload.get("exp"):
+                revocation_list.revoke(db, payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
+            session = None
+            if payload.get("sid"):
+                session = db.query(SessionModel).filter(SessionModel.id == UUID(payload["sid"])).first()
+        else:
+            session = db.query(SessionModel).filter(SessionModel.token_hash == hash_token(token)).first()
         if session:
             db.delete(session)
             db.commit()
+        session_cache.invalidate_token(token)
+
+    @staticmethod
+    def resolve_session(db: Session, token: str, user_id: str) -> Optional[SessionModel]:
+        """
+        Load a session together with its user and the user's profile.
+
+        Sessions, users and user profiles are joined in a single query, so
+        the caller gets a fully populated user in one round trip.
+
+        Args:
+            db: Database session
+            token: JWT token
+            user_id: User ID from the token's subject
+
+        Returns:
+            Session with ``user`` and ``user.profile`` loaded, or None
+        """
+        return (
+            db.query(SessionModel)
+            .join(SessionModel.user)
+            .outerjoin(User.profile)
+            .options(contains_eager(SessionModel.user).contains_eager(User.profile))
+            .filter(SessionModel.token_hash == hash_token(token), SessionModel.user_id == user_id)
+            .first()
+        )
+
+    @staticmethod
+    def load_user(db: Session, user_id: str) -> Optional[User]:
+        """
+        Load a user with their profile in one query.
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            User with ``profile`` loaded, or None
+        """
+        return (
+            db.query(User)
+            .outerjoin(User.profile)
+            .options(contains_eager(User.profile))
+            .filter(User.id == user_id)
+            .first()
+        )
+
+    @staticmethod
+    def _issue_access_token(user: User, session_id: UUID) -> str:
+        """Short-lived stateless access token, pre-cached so its first use needs no query."""
+        expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        token = create_access_token({"sub": str(user.id), "sid": str(session_id), "type": "access"}, expires_delta)
+        session_cache.put(token, user, user.profile, datetime.utcnow() + expires_delta)
+        return token
 
     @staticmethod
     def _create_session(db: Session, user: User, ip_address: Optional[str] = None,
-                       user_agent: Optional[str] = None) -> str:
+                       user_agent: Optional[str] = None) -> Tuple[str, Optional[str]]:
         """
         Create a new session for a user.
 
+        In stateless mode the session backs a long-lived refresh token and a
+        separate short-lived access token is issued; otherwise the session
+        token itself is the access token.
+
         Args:
             db: Database session
             user: User object
@@ -128,24 +254,30 @@ class AuthService:
             user_agent: Optional user agent string
 
         Returns:
-            JWT access token
+            Tuple of (JWT access token, refresh token or None)
         """
         # Create token
         token_data = {"sub": str(user.id)}
+        if AUTH_STATELESS:
+            token_data["type"] = "refresh"
         expires_delta = timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
         token = create_access_token(token_data, expires_delta)
 
         # Create session record
         expires_at = datetime.utcnow() + expires_delta
         session = SessionModel(
+            id=uuid4(),
             user_id=user.id,
-            token=token,
+            token_hash=hash_token(token),
             expires_at=expires_at,
             ip_address=ip_address,
             user_agent=user_agent
         )
 
+        session_id = session.id
         db.add(session)
         db.commit()
 
-        return token
+        if AUTH_STATELESS:
+            return AuthService._issue_access_token(user, session_id), token
+        return token, None
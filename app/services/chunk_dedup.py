@@ -0,0 +1,60 @@
+from typing import List
+
+import numpy as np
+
+from app.core.config import get_logger
+from app.services.minhash import MinHasher, LSHIndex, word_shingles, estimate_jaccard
+
+logger = get_logger(__name__)
+
+_NUM_PERM = 128
+_BANDS = 16
+
+
+def collapse_near_duplicates(chunks: List[dict], threshold: float) -> List[dict]:
+    """
+    Collapse near-duplicate chunks into one representative each.
+
+    Boilerplate such as learning objectives or navigation text repeats across
+    weekly chapters. The first occurrence is kept and every copy's location is
+    recorded in its `sources` list, so the index holds one point per distinct
+    paragraph.
+
+    Args:
+        chunks: Chunks in index order (dicts with content, source_file, chunk_index, file_hash)
+        threshold: Minimum estimated Jaccard similarity of word 3-gram sets
+
+    Returns:
+        Representative chunks, each with a `sources` list of all locations
+    """
+    hasher = MinHasher(num_perm=_NUM_PERM)
+    lsh = LSHIndex(num_perm=_NUM_PERM, bands=_BANDS)
+    signatures: List[np.ndarray] = []
+    kept: List[dict] = []
+
+    for chunk in chunks:
+        location = {
+            'source_file': chunk['source_file'],
+            'chunk_index': chunk['chunk_index'],
+            'file_hash': chunk.get('file_hash'),
+        }
+        signature = hasher.signature(word_shingles(chunk['content']))
+
+        duplicate_of = None
+        for candidate in lsh.query(signature):
+            if estimate_jaccard(signature, signatures[candidate]) >= threshold:
+                duplicate_of = candidate
+                break
+
+        if duplicate_of is not None:
+            kept[duplicate_of]['sources'].append(location)
+            continue
+
+        lsh.insert(len(kept), signature)
+        signatures.append(signature)
+        kept.append({**chunk, 'sources': [location]})
+
+    removed = len(chunks) - len(kept)
+    if removed:
+        logger.info(f"Collapsed {removed} near-duplicate chunks ({len(chunks)} -> {len(kept)}).")
+    return kept
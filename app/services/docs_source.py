@@ -0,0 +1,85 @@
+import hashlib
+from pathlib import Path
+from typing import Iterator, List, Optional
+from uuid import uuid4
+
+from app.core.config import get_logger, DOCS_PATH
+
+logger = get_logger(__name__)
+
+DOC_SUFFIXES = ('.md', '.mdx')
+
+# Paragraphs shorter than this are skipped when chunking
+MIN_CHUNK_LENGTH = 20
+
+# Bump whenever chunking changes, so stale index snapshots are detectable
+CHUNKER_VERSION = "paragraph-v2-dedup"
+
+
+def resolve_docs_path(docs_path: Optional[str] = None) -> Optional[Path]:
+    """
+    Locate the Docusaurus docs directory.
+
+    Args:
+        docs_path: Explicit path; falls back to DOCS_PATH and then the
+            frontend/docs locations relative to the backend directory
+
+    Returns:
+        Path to the docs directory, or None if it cannot be found
+    """
+    candidates = [docs_path] if docs_path else [DOCS_PATH, "../../frontend/docs", "../frontend/docs"]
+    for candidate in candidates:
+        if candidate and Path(candidate).exists():
+            return Path(candidate)
+
+    logger.error(f"Docs directory not found (tried {[c for c in candidates if c]})")
+    return None
+
+
+def is_doc_file(path: Path) -> bool:
+    return path.suffix.lower() in DOC_SUFFIXES
+
+
+def iter_doc_files(docs_path: Path) -> Iterator[Path]:
+    """Yield every MD/MDX file below the docs directory."""
+    for file_path in sorted(docs_path.rglob("*")):
+        if file_path.is_file() and is_doc_file(file_path):
+            yield file_path
+
+
+def file_sha256(file_path: Path) -> str:
+    """SHA-256 of a file's bytes, used to detect changed files."""
+    return hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+
+def read_doc_text(file_path: Path) -> str:
+    """Read a doc file as text with newlines normalized to LF."""
+    return file_path.read_bytes().decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def chunk_file(file_path: Path, docs_path: Path) -> List[dict]:
+    """
+    Split one Markdown file into paragraph chunks.
+
+    Returns:
+        List of chunk dicts with id, content, source_file, chunk_index and file_hash
+    """
+    raw = file_path.read_bytes()
+    # Normalize newlines the way text-mode reads do, so CRLF files chunk the same
+    content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    file_hash = hashlib.sha256(raw).hexdigest()
+
+    source_file = file_path.relative_to(docs_path).as_posix()
+    chunks = []
+
+    # Simple chunking: split by paragraphs
+    for i, paragraph in enumerate(content.split('\n\n')):
+        if len(paragraph.strip()) > MIN_CHUNK_LENGTH:  # Only include substantial paragraphs
+            chunks.append({
+                'id': str(uuid4()),
+                'content': paragraph.strip(),
+                'source_file': source_file,
+                'chunk_index': i,
+                'file_hash': file_hash
+            })
+    return chunks
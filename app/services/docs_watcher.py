@@ -0,0 +1,75 @@
+import asyncio
+from pathlib import Path
+from typing import Optional, Set
+
+from app.core.config import get_logger, DOCS_WATCH_DEBOUNCE_MS
+from app.services.docs_source import resolve_docs_path, is_doc_file
+from app.services.indexing_service import indexing_service
+
+logger = get_logger(__name__)
+
+
+class DocsWatcher:
+    """
+    Watches the docs directory and re-indexes changed files incrementally.
+
+    Intended for development and staging: bursts of saves are debounced into
+    one batch, and only the touched files are re-chunked, re-embedded and
+    upserted.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+    def start(self, docs_path: Optional[str] = None) -> bool:
+        """Start watching in the background. Returns False if watching is unavailable."""
+        root = resolve_docs_path(docs_path)
+        if root is None:
+            logger.error("Docs watcher not started: docs directory not found.")
+            return False
+
+        try:
+            import watchfiles  # noqa: F401 - installed with uvicorn[standard]
+        except ImportError:
+            logger.error("Docs watcher not started: the 'watchfiles' package is not installed.")
+            return False
+
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._watch(root.resolve()))
+        logger.info(f"Watching {root.resolve()} for docs changes.")
+        return True
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop_event.set()
+        await self._task
+        self._task = None
+
+    async def _watch(self, root: Path) -> None:
+        from watchfiles import awatch
+
+        async for changes in awatch(
+            root,
+            watch_filter=lambda _change, path: is_doc_file(Path(path)),
+            # Wait for a quiet period before yielding so an editor's burst of
+            # saves becomes one batch, but never hold changes longer than 10x that.
+            step=DOCS_WATCH_DEBOUNCE_MS,
+            debounce=DOCS_WATCH_DEBOUNCE_MS * 10,
+            stop_event=self._stop_event,
+        ):
+            touched: Set[Path] = {Path(path) for _change, path in changes}
+            await self._reindex(root, touched)
+
+    async def _reindex(self, root: Path, touched: Set[Path]) -> None:
+        for file_path in sorted(touched):
+            try:
+                # Embedding is CPU-bound; keep it off the API event loop
+                await asyncio.to_thread(indexing_service.reindex_file, file_path, root)
+            except Exception as e:
+                logger.error(f"Error re-indexing {file_path}: {e}")
+
+
+# Singleton instance of the watcher
+docs_watcher = DocsWatcher()
@@ -0,0 +1,156 @@
+"""
+Persistent, content-addressed embedding cache.
+
+Vectors are stored in a local SQLite file keyed by (model name, hash of the
+normalized chunk text), so re-indexing unchanged paragraphs - or rebuilding a
+collection with different HNSW/quantization settings - needs no model
+inference.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import get_logger
+
+logger = get_logger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_BATCH = 500
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so whitespace-only edits map to the same cache entry."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache with LRU size limits and hit-rate stats."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used_at)")
+        self._conn.commit()
+        logger.info(f"Embedding cache opened at {path}.")
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached vectors for texts.
+
+        Returns:
+            One vector per text, or None where the text is not cached
+        """
+        hashes = [text_hash(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        now = time.time()
+
+        with self._lock:
+            unique = list(dict.fromkeys(hashes))
+            for start in range(0, len(unique), _QUERY_BATCH):
+                batch = unique[start:start + _QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for digest, blob in rows:
+                    found[digest] = np.frombuffer(blob, dtype=np.float32).tolist()
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE embeddings SET last_used_at = ? WHERE model = ? AND text_hash IN ({placeholders})",
+                        [now, model, *batch],
+                    )
+            self._conn.commit()
+
+        results = [found.get(digest) for digest in hashes]
+        hit_count = sum(1 for vector in results if vector is not None)
+        self.hits += hit_count
+        self.misses += len(results) - hit_count
+        return results
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store vectors for texts under the given model."""
+        now = time.time()
+        rows = []
+        for text, vector in zip(texts, vectors):
+            if vector is None:
+                continue
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append((model, text_hash(text), array.shape[0], array.tobytes(), now, now))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, dimension, vector, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def evict_unused_models(self, active_models: Iterable[str]) -> int:
+        """Delete entries for models no longer in use. Returns the number of rows removed."""
+        active = list(active_models)
+        placeholders = ",".join("?" * len(active))
+        with self._lock:
+            cursor = self._conn.execute(f"DELETE FROM embeddings WHERE model NOT IN ({placeholders})", active)
+            self._conn.commit()
+        if cursor.rowcount:
+            logger.info(f"Evicted {cursor.rowcount} cached embeddings for unused models.")
+        return cursor.rowcount
+
+    def enforce_size_limit(self) -> int:
+        """Evict least recently used entries beyond max_entries. Returns the number of rows removed."""
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            excess = count - self.max_entries
+            if excess <= 0:
+                return 0
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_used_at ASC LIMIT ?)",
+                (excess,),
+            )
+            self._conn.commit()
+        logger.info(f"Evicted {excess} least recently used cached embeddings.")
+        return excess
+
+    def stats(self) -> Dict:
+        """Entry counts per model plus hit-rate counters since startup."""
+        with self._lock:
+            per_model = dict(self._conn.execute("SELECT model, COUNT(*) FROM embeddings GROUP BY model").fetchall())
+        lookups = self.hits + self.misses
+        return {
+            "entries": sum(per_model.values()),
+            "max_entries": self.max_entries,
+            "entries_per_model": per_model,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
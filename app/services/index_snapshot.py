@@ -0,0 +1,257 @@
+"""
+Portable index snapshots for fast cold starts.
+
+A snapshot is a single self-contained file:
+
+    [0:8)    magic b"BKIDX001"
+    [8:16)   manifest length M (uint64, little endian)
+    [16:16+M) manifest JSON (model, dimension, count, chunker version, content hashes)
+    padding to a 64-byte boundary
+    vectors   float32, count x dimension, row-major
+    offsets   uint64, count + 1 byte offsets into the payload table
+    payloads  UTF-8 JSON records, one per vector
+
+The vector block can be memory-mapped directly by LocalIndex, or bulk-loaded
+into a new Qdrant index version.
+
+Snapshots are created and loaded with `python -m app.indexing export|import`.
+"""
+import hashlib
+import json
+import os
+import struct
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import get_logger, EMBEDDING_MODEL_NAME, EMBEDDING_DIMENSION, QDRANT_COLLECTION
+from app.services.docs_source import CHUNKER_VERSION
+
+logger = get_logger(__name__)
+
+MAGIC = b"BKIDX001"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sQ")
+_ALIGNMENT = 64
+_SCROLL_BATCH = 256
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _content_hashes(records: List[Dict]) -> Dict[str, str]:
+    """SHA-256 per source file over its chunks in chunk order."""
+    by_file: Dict[str, List[Tuple[int, str]]] = {}
+    for record in records:
+        payload = record["payload"]
+        by_file.setdefault(payload.get("source_file", ""), []).append(
+            (payload.get("chunk_index", 0), payload.get("content", ""))
+        )
+    hashes = {}
+    for source_file, chunks in sorted(by_file.items()):
+        digest = hashlib.sha256()
+        for _, content in sorted(chunks):
+            digest.update(content.encode("utf-8"))
+            digest.update(b"\0")
+        hashes[source_file] = digest.hexdigest()
+    return hashes
+
+
+def write_snapshot(path: str, ids: List[str], vectors: np.ndarray, payloads: List[Dict],
+                   source: Optional[str] = None) -> Dict:
+    """
+    Write vectors and payloads to a snapshot file.
+
+    Returns:
+        The manifest written to the file
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    count, dimension = vectors.shape if vectors.size else (0, EMBEDDING_DIMENSION)
+    records = [{"id": str(point_id), "payload": payload} for point_id, payload in zip(ids, payloads)]
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "model": EMBEDDING_MODEL_NAME,
+        "dimension": dimension,
+        "count": count,
+        "distance": "cosine",
+        "chunker_version": CHUNKER_VERSION,
+        "source": source,
+        "created_at": datetime.utcnow().isoformat(),
+        "content_hashes": _content_hashes(records),
+    }
+    manifest_bytes = json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+    encoded = [json.dumps(record, ensure_ascii=False).encode("utf-8") for record in records]
+    offsets = np.zeros(count + 1, dtype="<u8")
+    if encoded:
+        offsets[1:] = np.cumsum([len(blob) for blob in encoded])
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(manifest_bytes)))
+        f.write(manifest_bytes)
+        f.write(b"\0" * (_align(f.tell()) - f.tell()))
+        f.write(vectors.astype("<f4", copy=False).tobytes())
+        f.write(offsets.tobytes())
+        for blob in encoded:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+    logger.info(f"Wrote snapshot {path} with {count} vectors.")
+    return manifest
+
+
+def read_manifest(path: str) -> Tuple[Dict, int]:
+    """
+    Read a snapshot's manifest.
+
+    Returns:
+        Tuple of (manifest, byte offset of the vector block)
+
+    Raises:
+        ValueError: If the file is not a snapshot of a supported version
+    """
+    with open(path, "rb") as f:
+        magic, length = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an index snapshot")
+        manifest = json.loads(f.read(length).decode("utf-8"))
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version {manifest.get('format_version')}")
+    return manifest, _align(_HEADER.size + length)
+
+
+@dataclass
+class SnapshotHit:
+    id: str
+    score: float
+    payload: Dict
+
+
+@dataclass
+class SnapshotQueryResult:
+    points: List[SnapshotHit]
+
+
+class LocalIndex:
+    """
+    Brute-force cosine retrieval over a memory-mapped snapshot.
+
+    Exposes the same `query_points(...).points[i].score/.payload` shape the
+    RAG pipeline uses with Qdrant, so it can stand in for it in test
+    environments and new regions.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.manifest, vectors_offset = read_manifest(path)
+        count, dimension = self.manifest["count"], self.manifest["dimension"]
+
+        self.vectors = np.memmap(path, dtype="<f4", mode="r", offset=vectors_offset, shape=(count, dimension))
+        offsets_offset = vectors_offset + count * dimension * 4
+        self._offsets = np.memmap(path, dtype="<u8", mode="r", offset=offsets_offset, shape=(count + 1,))
+        self._payload_base = offsets_offset + (count + 1) * 8
+        self._raw = np.memmap(path, dtype=np.uint8, mode="r")
+
+        norms = np.linalg.norm(self.vectors, axis=1)
+        self._inverse_norms = np.where(norms > 0, 1.0 / np.maximum(norms, 1e-12), 0.0).astype(np.float32)
+        logger.info(f"Loaded local index {path} with {count} vectors.")
+
+    def __len__(self) -> int:
+        return self.manifest["count"]
+
+    def record(self, row: int) -> Dict:
+        start = self._payload_base + int(self._offsets[row])
+        end = self._payload_base + int(self._offsets[row + 1])
+        return json.loads(bytes(self._raw[start:end]).decode("utf-8"))
+
+    def iter_records(self) -> Iterator[Tuple[Dict, np.ndarray]]:
+        for row in range(len(self)):
+            yield self.record(row), self.vectors[row]
+
+    def query_points(self, query: List[float], limit: int = 5, **_kwargs) -> SnapshotQueryResult:
+        if len(self) == 0:
+            return SnapshotQueryResult(points=[])
+        query_vector = np.asarray(query, dtype=np.float32)
+        query_norm = np.linalg.norm(query_vector)
+        scores = (self.vectors @ query_vector) * self._inverse_norms / (query_norm or 1.0)
+
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+
+        hits = []
+        for row in top:
+            record = self.record(int(row))
+            hits.append(SnapshotHit(id=record["id"], score=float(scores[row]), payload=record["payload"]))
+        return SnapshotQueryResult(points=hits)
+
+
+def export_snapshot(path: str, collection_name: str = QDRANT_COLLECTION) -> Dict:
+    """Export every point of a Qdrant collection (or alias) to a snapshot file."""
+    from app.services.indexing_service import indexing_service
+
+    ids, vectors, payloads = [], [], []
+    offset = None
+    while True:
+        batch, offset = indexing_service.qdrant_client.scroll(
+            collection_name=collection_name,
+            limit=_SCROLL_BATCH,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        for point in batch:
+            ids.append(str(point.id))
+            vectors.append(point.vector)
+            payloads.append(point.payload)
+        if offset is None:
+            break
+
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1) if vectors else np.zeros((0, EMBEDDING_DIMENSION), dtype=np.float32)
+    return write_snapshot(path, ids, matrix, payloads, source=collection_name)
+
+
+async def import_snapshot(path: str, progress=None) -> str:
+    """
+    Bulk-load a snapshot into a new index version and make it live.
+
+    Returns:
+        Name of the new live collection
+
+    Raises:
+        ValueError: If the snapshot was built with a different model or dimension
+    """
+    from app.services.indexing_service import indexing_service
+
+    index = LocalIndex(path)
+    manifest = index.manifest
+    if manifest["model"] != EMBEDDING_MODEL_NAME or manifest["dimension"] != EMBEDDING_DIMENSION:
+        raise ValueError(
+            f"Snapshot was built with {manifest['model']} ({manifest['dimension']}d), "
+            f"but the service uses {EMBEDDING_MODEL_NAME} ({EMBEDDING_DIMENSION}d)"
+        )
+
+    version = indexing_service.new_version_name()
+    await indexing_service.create_collection(version)
+    if progress:
+        progress.set_total(len(index))
+        progress.set_phase("uploading")
+
+    records = [index.record(row) for row in range(len(index))]
+    indexing_service.qdrant_client.upload_collection(
+        collection_name=version,
+        vectors=index.vectors,
+        payload=[record["payload"] for record in records],
+        ids=[record["id"] for record in records],
+        wait=True
+    )
+    if progress:
+        progress.advance(len(index))
+
+    indexing_service.publish_version(version, len(index), progress=progress)
+    logger.info(f"Imported snapshot {path} into '{version}'.")
+    return version
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from app.core.config import get_logger
+
+logger = get_logger(__name__)
+
+# Keep only the most recent jobs so status lookups stay cheap.
+MAX_JOB_HISTORY = 20
+
+
+@dataclass
+class IndexingProgress:
+    """Progress of a single indexing run, updated by the worker thread."""
+    job_id: str = field(default_factory=lambda: str(uuid4()))
+    status: str = "pending"  # pending, running, completed, failed
+    phase: str = "queued"
+    chunks_total: int = 0
+    chunks_processed: int = 0
+    cache_hits: int = 0
+    files_scanned: int = 0
+    tokens: int = 0
+    points_uploaded: int = 0
+    embed_seconds: float = 0.0
+    upload_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    _started_monotonic: Optional[float] = None
+    _finished_monotonic: Optional[float] = None
+
+    def set_phase(self, phase: str) -> None:
+        self.phase = phase
+        logger.info(f"Indexing job {self.job_id}: phase '{phase}'")
+
+    def set_total(self, total: int) -> None:
+        self.chunks_total = total
+
+    def advance(self, count: int = 1) -> None:
+        self.chunks_processed += count
+
+    def add_error(self, message: str) -> None:
+        self.errors.append(message)
+
+    def mark_running(self) -> None:
+        self.status = "running"
+        self.started_at = datetime.utcnow()
+        self._started_monotonic = time.monotonic()
+
+    def mark_finished(self, error: Optional[str] = None) -> None:
+        self.finished_at = datetime.utcnow()
+        self._finished_monotonic = time.monotonic()
+        if error:
+            self.status = "failed"
+            self.add_error(error)
+        else:
+            self.status = "completed"
+            self.phase = "done"
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ("pending", "running")
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self._started_monotonic is None:
+            return 0.0
+        end = self._finished_monotonic or time.monotonic()
+        return end - self._started_monotonic
+
+    @property
+    def throughput(self) -> float:
+        """Chunks processed per second since the job started."""
+        elapsed = self.elapsed_seconds
+        return self.chunks_processed / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "phase": self.phase,
+            "chunks_total": self.chunks_total,
+            "chunks_processed": self.chunks_processed,
+            "cache_hits": self.cache_hits,
+            "files_scanned": self.files_scanned,
+            "tokens": self.tokens,
+            "points_uploaded": self.points_uploaded,
+            "embed_seconds": round(self.embed_seconds, 2),
+            "upload_seconds": round(self.upload_seconds, 2),
+            "throughput_chunks_per_sec": round(self.throughput, 2),
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "errors": list(self.errors),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class IndexingJobManager:
+    """
+    Runs indexing off the request path, one job at a time.
+
+    Each job gets its own thread and event loop so the embedding work never
+    blocks the API worker's loop. Starting a job while another is active
+    joins the active one instead of launching a second build.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, IndexingProgress]" = OrderedDict()
+        self._active_id: Optional[str] = None
+
+    def start(self, runner: Callable[[IndexingProgress], Awaitable[None]]) -> Tuple[IndexingProgress, bool]:
+        """
+        Start an indexing job, or join the one already running.
+
+        Args:
+            runner: Coroutine factory that performs the indexing and reports to the progress object
+
+        Returns:
+            Tuple of (job progress, whether a new job was created)
+        """
+        with self._lock:
+            active = self._jobs.get(self._active_id) if self._active_id else None
+            if active and active.is_active:
+                logger.info(f"Indexing job {active.job_id} already running; joining it.")
+                return active, False
+
+            progress = IndexingProgress()
+            self._jobs[progress.job_id] = progress
+            while len(self._jobs) > MAX_JOB_HISTORY:
+                self._jobs.popitem(last=False)
+            self._active_id = progress.job_id
+
+        thread = threading.Thread(
+            target=self._run,
+            args=(runner, progress),
+            name=f"indexing-{progress.job_id[:8]}",
+            daemon=True,
+        )
+        thread.start()
+        return progress, True
+
+    def _run(self, runner: Callable[[IndexingProgress], Awaitable[None]], progress: IndexingProgress) -> None:
+        progress.mark_running()
+        try:
+            asyncio.run(runner(progress))
+            progress.mark_finished()
+            logger.info(f"Indexing job {progress.job_id} completed in {progress.elapsed_seconds:.1f}s.")
+        except Exception as e:
+            logger.error(f"Indexing job {progress.job_id} failed: {e}")
+            progress.mark_finished(error=str(e))
+
+    def get(self, job_id: str) -> Optional[IndexingProgress]:
+        return self._jobs.get(job_id)
+
+    def latest(self) -> Optional[IndexingProgress]:
+        if not self._jobs:
+            return None
+        return next(reversed(self._jobs.values()))
+
+
+# Singleton instance of the job manager
+indexing_jobs = IndexingJobManager()
@@ -1,29 +1,49 @@
 import asyncio
 import os
-from typing import List
+import time
+from datetime import datetime
+from typing import List, Optional, TYPE_CHECKING
 from pathlib import Path
-from app.core.config import get_logger
+from app.core.config import (
+    get_logger, EMBEDDING_MODEL_NAME, EMBEDDING_DIMENSION, INDEXING_BATCH_SIZE, INDEXING_WORKERS,
+    EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES,
+    QDRANT_COLLECTION, INDEX_VERSIONS_TO_KEEP, INDEX_VALIDATION_QUERIES,
+    INDEXING_DEDUP_ENABLED, INDEXING_DEDUP_THRESHOLD
+)
+from app.services.embedding_cache import EmbeddingCache
+from app.services.docs_source import resolve_docs_path, iter_doc_files, chunk_file, file_sha256
+from app.services.chunk_dedup import collapse_near_duplicates
+from app.services.parallel_embedding import embed_in_process_pool, resolve_worker_count
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from qdrant_client import QdrantClient, models
 from qdrant_client.http import models as rest
-from uuid import uuid4
+
+if TYPE_CHECKING:
+    from app.services.indexing_jobs import IndexingProgress
 
 logger = get_logger(__name__)
 
 class IndexingService:
     def __init__(self):
-        self.embeddings_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        print(f"QDRANT_URL from env: {os.getenv('QDRANT_URL')}")
-        print(f"QDRANT_API_KEY from env: {os.getenv('QDRANT_API_KEY')}")
-        print(f"QdrantClient params: url={os.getenv('QDRANT_URL')}, api_key={'*' * len(os.getenv('QDRANT_API_KEY', '')) if os.getenv('QDRANT_API_KEY') else 'None'}, prefer_grpc=False")
+        self.embeddings_model = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME)
+        logger.info(f"Connecting to Qdrant at {os.getenv('QDRANT_URL')} (API key {'set' if os.getenv('QDRANT_API_KEY') else 'not set'}).")
         self.qdrant_client = QdrantClient(
             url=os.getenv("QDRANT_URL"),
             api_key=os.getenv("QDRANT_API_KEY"),
             prefer_grpc=False
         )
+        # Tunable per run (e.g. by the offline indexing CLI)
+        self.batch_size = INDEXING_BATCH_SIZE
+        self.workers = INDEXING_WORKERS
+        self.embedding_cache = None
+        if EMBEDDING_CACHE_PATH:
+            try:
+                self.embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES)
+            except Exception as e:
+                logger.error(f"Embedding cache unavailable, embedding without it: {e}")
         logger.info("IndexingService initialized.")
 
-    async def create_collection(self, collection_name: str = "book_content"):
+    async def create_collection(self, collection_name: str = QDRANT_COLLECTION):
         """Create a Qdrant collection for storing book content embeddings."""
         try:
             # Check if collection already exists
@@ -38,96 +58,296 @@ class IndexingService:
             self.qdrant_client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
-                    size=384,  # Size of all-MiniLM-L6-v2 embeddings
+                    size=EMBEDDING_DIMENSION,  # 384 for all-MiniLM-L6-v2
                     distance=models.Distance.COSINE
                 )
             )
             
+            # Keyword indexes so single-file re-indexing can find a file's points
+            # cheaply, including deduplicated points that merely list it in `sources`
+            for field_name in ("source_file", "sources[].source_file"):
+                self.qdrant_client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=models.PayloadSchemaType.KEYWORD
+                )
+            
             logger.info(f"Collection '{collection_name}' created successfully.")
         except Exception as e:
             logger.error(f"Error creating collection: {e}")
             raise
 
-    def extract_book_content(self) -> List[dict]:
+    def extract_book_content(self, docs_path: Optional[str] = None,
+                             progress: Optional["IndexingProgress"] = None) -> List[dict]:
         """
         Extract content from the book files (from Docusaurus docs directory).
-        This method should read the MD/MDX files from the frontend/docs directory.
+        This method reads the MD/MDX files from the frontend/docs directory.
         """
         content_chunks = []
-        
-        # Look for book content in the frontend docs directory
-        docs_path = Path("../../frontend/docs")
-        
-        if not docs_path.exists():
-            # Try alternative path - relative to backend directory
-            docs_path = Path("../frontend/docs")
-            
-        if not docs_path.exists():
-            logger.error(f"Docs directory not found at {docs_path.absolute()}")
+
+        root = resolve_docs_path(docs_path)
+        if root is None:
             return content_chunks
 
         # Process all MD/MDX files in the docs directory
-        for file_path in docs_path.rglob("*"):
-            if file_path.suffix.lower() in ['.md', '.mdx']:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                        # Simple chunking: split by paragraphs
-                        paragraphs = content.split('\n\n')
-                        
-                        for i, paragraph in enumerate(paragraphs):
-                            if len(paragraph.strip()) > 20:  # Only include substantial paragraphs
-                                content_chunks.append({
-                                    'id': str(uuid4()),
-                                    'content': paragraph.strip(),
-                                    'source_file': str(file_path.relative_to(docs_path)),
-                                    'chunk_index': i
-                                })
-                except Exception as e:
-                    logger.error(f"Error reading file {file_path}: {e}")
+        for file_path in iter_doc_files(root):
+            if progress:
+                progress.files_scanned += 1
+            try:
+                content_chunks.extend(chunk_file(file_path, root))
+            except Exception as e:
+                logger.error(f"Error reading file {file_path}: {e}")
         
         logger.info(f"Extracted {len(content_chunks)} content chunks from book.")
         return content_chunks
 
-    async def index_book_content(self, collection_name: str = "book_content"):
-        """Index the book content into the Qdrant collection."""
-        await self.create_collection(collection_name)
-        
-        content_chunks = self.extract_book_content()
-        
-        if not content_chunks:
-            logger.warning("No content found to index.")
-            return
+    def reindex_file(self, file_path: Path, docs_path: Path, collection_name: str = QDRANT_COLLECTION,
+                     progress: Optional["IndexingProgress"] = None) -> int:
+        """
+        Replace the indexed chunks of a single docs file.
 
-        # Create embeddings for each content chunk
-        points = []
-        for chunk in content_chunks:
-            try:
-                # Generate embedding for the content
-                embedding = self.embeddings_model.embed_query(chunk['content'])
-                
-                # Create a Qdrant point
-                point = rest.PointStruct(
-                    id=chunk['id'],
-                    vector=embedding,
+        Removes the file's locations from the index (see _detach_file), then
+        re-chunks, re-embeds and upserts it. A file that no longer exists is
+        simply removed. Near-duplicates are only collapsed within the file
+        here, so a paragraph the file shares with other files is stored once
+        more until the next full rebuild collapses it again.
+
+        Returns:
+            Number of points written for the file
+        """
+        source_file = file_path.relative_to(docs_path).as_posix()
+        self._detach_file(collection_name, source_file)
+
+        if not file_path.exists():
+            logger.info(f"Removed '{source_file}' from the index.")
+            return 0
+
+        chunks = chunk_file(file_path, docs_path)
+        if INDEXING_DEDUP_ENABLED:
+            chunks = collapse_near_duplicates(chunks, INDEXING_DEDUP_THRESHOLD)
+
+        started = time.perf_counter()
+        vectors = self.embed_texts([chunk['content'] for chunk in chunks], progress=progress)
+        points = self._build_points(chunks, vectors)
+        if progress:
+            progress.files_scanned += 1
+            progress.chunks_total += len(chunks)
+            progress.tokens += self.count_tokens([chunk['content'] for chunk in chunks])
+            progress.embed_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        if points:
+            self.qdrant_client.upsert(collection_name=collection_name, points=points)
+        if progress:
+            progress.upload_seconds += time.perf_counter() - started
+            progress.points_uploaded += len(points)
+        logger.info(f"Re-indexed '{source_file}' with {len(points)} chunks.")
+        return len(points)
+
+    def _detach_file(self, collection_name: str, source_file: str) -> None:
+        """
+        Remove a file's locations from the index without losing other files' paragraphs.
+
+        A deduplicated point lists every file its paragraph appears in. Points
+        found only in this file are deleted; points shared with other files
+        just drop this file from `sources` and, if it was their representative
+        location, take the next remaining location instead.
+        """
+        file_filter = models.Filter(should=[
+            models.FieldCondition(key="source_file", match=models.MatchValue(value=source_file)),
+            models.FieldCondition(key="sources[].source_file", match=models.MatchValue(value=source_file)),
+        ])
+        to_delete = []
+        offset = None
+        while True:
+            batch, offset = self.qdrant_client.scroll(
+                collection_name=collection_name,
+                scroll_filter=file_filter,
+                limit=256,
+                offset=offset,
+                with_payload=["source_file", "sources"],
+                with_vectors=False
+            )
+            for point in batch:
+                remaining = [location for location in point.payload.get("sources") or []
+                             if location.get("source_file") != source_file]
+                if not remaining:
+                    to_delete.append(point.id)
+                    continue
+                representative = remaining[0]
+                self.qdrant_client.set_payload(
+                    collection_name=collection_name,
                     payload={
-                        'content': chunk['content'],
+                        "sources": remaining,
+                        "source_file": representative["source_file"],
+                        "chunk_index": representative["chunk_index"],
+                        "file_hash": representative.get("file_hash"),
+                    },
+                    points=[point.id]
+                )
+            if offset is None:
+                break
+
+        if to_delete:
+            self.qdrant_client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=to_delete)
+            )
+
+    def _build_points(self, chunks: List[dict], vectors: List[Optional[List[float]]]) -> List[rest.PointStruct]:
+        """Pair chunks with their vectors, skipping chunks whose embedding failed."""
+        points = []
+        for chunk, embedding in zip(chunks, vectors):
+            if embedding is None:
+                continue
+            # Create a Qdrant point
+            points.append(rest.PointStruct(
+                id=chunk['id'],
+                vector=embedding,
+                payload={
+                    'content': chunk['content'],
+                    'source_file': chunk['source_file'],
+                    'chunk_index': chunk['chunk_index'],
+                    'file_hash': chunk.get('file_hash'),
+                    # Every location this (possibly deduplicated) paragraph appears at
+                    'sources': chunk.get('sources') or [{
                         'source_file': chunk['source_file'],
-                        'chunk_index': chunk['chunk_index']
-                    }
+                        'chunk_index': chunk['chunk_index'],
+                        'file_hash': chunk.get('file_hash'),
+                    }]
+                }
+            ))
+        return points
+
+    def embed_texts(self, texts: List[str], progress: Optional["IndexingProgress"] = None,
+                    workers: Optional[int] = None) -> List[Optional[List[float]]]:
+        """
+        Embed texts, serving unchanged paragraphs from the embedding cache.
+
+        Args:
+            texts: Texts to embed
+            progress: Optional progress tracker advanced per finished batch
+            workers: Worker process count (defaults to self.workers, 0 = one per core)
+
+        Returns:
+            One vector per text, in input order; None where embedding failed
+        """
+        if not self.embedding_cache:
+            return self._compute_embeddings(texts, progress, workers)
+
+        vectors = self.embedding_cache.get_many(EMBEDDING_MODEL_NAME, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        hits = len(texts) - len(missing)
+        if progress:
+            progress.cache_hits += hits
+            progress.advance(hits)
+        logger.info(f"Embedding cache: {hits} hits, {len(missing)} chunks to embed.")
+
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            computed = self._compute_embeddings(missing_texts, progress, workers)
+            self.embedding_cache.put_many(EMBEDDING_MODEL_NAME, missing_texts, computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+        return vectors
+
+    def _compute_embeddings(self, texts: List[str], progress: Optional["IndexingProgress"] = None,
+                            workers: Optional[int] = None) -> List[Optional[List[float]]]:
+        """Run the embedding model over texts in batches, optionally across a process pool."""
+        if not texts:
+            return []
+
+        workers = resolve_worker_count(self.workers if workers is None else workers)
+        # Cache hits may already be counted; a failed pool run rewinds to here
+        processed_before = progress.chunks_processed if progress else 0
+
+        if workers > 1 and len(texts) > self.batch_size:
+            try:
+                matrix = embed_in_process_pool(
+                    texts,
+                    model_name=EMBEDDING_MODEL_NAME,
+                    dimension=EMBEDDING_DIMENSION,
+                    workers=workers,
+                    batch_size=self.batch_size,
+                    on_progress=progress.advance if progress else None
                 )
-                points.append(point)
+                return matrix.tolist()
+            except Exception as e:
+                logger.error(f"Parallel embedding failed, falling back to a single process: {e}")
+                if progress:
+                    progress.add_error(f"Parallel embedding failed: {e}")
+                    progress.chunks_processed = processed_before
+
+        vectors: List[Optional[List[float]]] = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            try:
+                vectors.extend(self.embeddings_model.embed_documents(batch))
             except Exception as e:
-                logger.error(f"Error creating embedding for chunk {chunk['id']}: {e}")
+                logger.error(f"Error creating embeddings for chunks {start}-{start + len(batch) - 1}: {e}")
+                if progress:
+                    progress.add_error(f"Embedding failed for chunks {start}-{start + len(batch) - 1}: {e}")
+                vectors.extend([None] * len(batch))
+            if progress:
+                progress.advance(len(batch))
+        return vectors
+
+    async def index_book_content(self, collection_name: str = QDRANT_COLLECTION, progress: Optional["IndexingProgress"] = None,
+                                 docs_path: Optional[str] = None):
+        """
+        Index the book content into the Qdrant collection.
+
+        Args:
+            collection_name: Target Qdrant collection
+            progress: Optional progress tracker updated as the build advances
+            docs_path: Optional docs directory override
+
+        Returns:
+            Number of points uploaded
+        """
+        await self.create_collection(collection_name)
+
+        if progress:
+            progress.set_phase("extracting")
+        content_chunks = self.extract_book_content(docs_path, progress=progress)
         
+        if not content_chunks:
+            logger.warning("No content found to index.")
+            return 0
+
+        if INDEXING_DEDUP_ENABLED:
+            if progress:
+                progress.set_phase("deduplicating")
+            content_chunks = collapse_near_duplicates(content_chunks, INDEXING_DEDUP_THRESHOLD)
+
+        if progress:
+            progress.set_total(len(content_chunks))
+            progress.tokens += self.count_tokens([chunk['content'] for chunk in content_chunks])
+            progress.set_phase("embedding")
+
+        # Create embeddings for all content chunks (in order)
+        started = time.perf_counter()
+        vectors = self.embed_texts([chunk['content'] for chunk in content_chunks], progress=progress)
+        if progress:
+            progress.embed_seconds += time.perf_counter() - started
+
+        points = self._build_points(content_chunks, vectors)
+
         # Upload all points to Qdrant
         if points:
+            if progress:
+                progress.set_phase("uploading")
+            started = time.perf_counter()
             try:
                 self.qdrant_client.upload_points(
                     collection_name=collection_name,
-                    points=points
+                    points=points,
+                    batch_size=self.batch_size,
+                    wait=True
                 )
+                if progress:
+                    progress.upload_seconds += time.perf_counter() - started
+                    progress.points_uploaded += len(points)
                 logger.info(f"Successfully uploaded {len(points)} points to Qdrant.")
             except Exception as e:
                 logger.error(f"Error uploading points to Qdrant: {e}")
@@ -135,4 +355,242 @@ class IndexingService:
         else:
             logger.warning("No valid points to upload to Qdrant.")
 
+        if self.embedding_cache:
+            self.embedding_cache.evict_unused_models([EMBEDDING_MODEL_NAME])
+            self.embedding_cache.enforce_size_limit()
+            logger.info(f"Embedding cache stats: {self.embedding_cache.stats()}")
+
+        return len(points)
+
+    def incremental_update(self, docs_path: Optional[str] = None, collection_name: str = QDRANT_COLLECTION,
+                           progress: Optional["IndexingProgress"] = None) -> dict:
+        """
+        Re-index only files whose content changed since they were indexed.
+
+        Compares each file's hash with the `file_hash` stored on its points;
+        files removed from the docs tree are dropped from the index.
+
+        Returns:
+            Counts of changed, removed and unchanged files
+        """
+        root = resolve_docs_path(docs_path)
+        if root is None:
+            raise RuntimeError("Docs directory not found")
+
+        indexed_hashes = self._indexed_file_hashes(collection_name)
+        on_disk = {file_path.relative_to(root).as_posix(): file_path for file_path in iter_doc_files(root)}
+
+        changed = [path for rel, path in on_disk.items() if indexed_hashes.get(rel) != file_sha256(path)]
+        removed = [root / rel for rel in indexed_hashes if rel not in on_disk]
+        logger.info(f"Incremental update: {len(changed)} changed, {len(removed)} removed, "
+                    f"{len(on_disk) - len(changed)} unchanged files.")
+
+        if progress:
+            progress.set_phase("embedding")
+        for file_path in changed + removed:
+            try:
+                self.reindex_file(file_path, root, collection_name, progress=progress)
+            except Exception as e:
+                logger.error(f"Error re-indexing {file_path}: {e}")
+                if progress:
+                    progress.add_error(f"Re-indexing {file_path} failed: {e}")
+
+        return {
+            "changed_files": len(changed),
+            "removed_files": len(removed),
+            "unchanged_files": len(on_disk) - len(changed),
+        }
+
+    def _indexed_file_hashes(self, collection_name: str) -> dict:
+        """
+        Map of source_file -> file_hash for everything currently in the collection.
+
+        Reads every location in `sources`, so files whose paragraphs were all
+        collapsed into other files' points are still seen as indexed.
+        """
+        hashes = {}
+        offset = None
+        while True:
+            batch, offset = self.qdrant_client.scroll(
+                collection_name=collection_name,
+                limit=1000,
+                offset=offset,
+                with_payload=["source_file", "file_hash", "sources"],
+                with_vectors=False
+            )
+            for point in batch:
+                hashes[point.payload.get("source_file")] = point.payload.get("file_hash")
+                for location in point.payload.get("sources") or []:
+                    if location.get("file_hash"):
+                        hashes[location["source_file"]] = location["file_hash"]
+            if offset is None:
+                return hashes
+
+    def count_tokens(self, texts: List[str]) -> int:
+        """Count model tokens for texts, falling back to whitespace words."""
+        tokenizer = getattr(getattr(self.embeddings_model, "client", None), "tokenizer", None)
+        if tokenizer is None:
+            return sum(len(text.split()) for text in texts)
+        return sum(len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"])
+
+    def _version_prefix(self) -> str:
+        return f"{QDRANT_COLLECTION}_v"
+
+    def _validated_marker(self, version: str) -> str:
+        """Alias recording that a version passed validation (dropped with its collection)."""
+        return f"{version}_validated"
+
+    def list_index_versions(self) -> List[str]:
+        """Versioned collections that passed validation (plus the live one), oldest first."""
+        collections = self.qdrant_client.get_collections()
+        prefix = self._version_prefix()
+        aliases = self.qdrant_client.get_aliases().aliases
+        validated = {alias.collection_name for alias in aliases
+                     if alias.alias_name in (QDRANT_COLLECTION, self._validated_marker(alias.collection_name))}
+        return sorted(c.name for c in collections.collections if c.name.startswith(prefix) and c.name in validated)
+
+    def get_live_version(self) -> Optional[str]:
+        """Name of the collection the live alias currently points to."""
+        aliases = self.qdrant_client.get_aliases()
+        for alias in aliases.aliases:
+            if alias.alias_name == QDRANT_COLLECTION:
+                return alias.collection_name
+        return None
+
+    async def rebuild_index(self, progress: Optional["IndexingProgress"] = None,
+                            docs_path: Optional[str] = None) -> str:
+        """
+        Build a fresh versioned collection and switch the live alias to it.
+
+        Readers keep querying the previous version until the new one has been
+        fully uploaded and validated, so a rebuild never exposes a partial index.
+        A version that fails to build or validate is deleted.
+
+        Returns:
+            Name of the new live collection
+
+        Raises:
+            RuntimeError: If the new collection fails validation
+        """
+        version = self.new_version_name()
+        logger.info(f"Building index version '{version}'.")
+
+        try:
+            uploaded = await self.index_book_content(version, progress=progress, docs_path=docs_path)
+        except Exception:
+            self._discard_version(version)
+            raise
+        self.publish_version(version, uploaded, progress=progress)
+        return version
+
+    def new_version_name(self) -> str:
+        return f"{self._version_prefix()}{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+
+    def publish_version(self, version: str, expected_points: int,
+                        progress: Optional["IndexingProgress"] = None) -> None:
+        """
+        Validate a fully uploaded index version, make it live and prune old versions.
+
+        A version that fails validation is deleted, so it can never be rolled back to.
+
+        Raises:
+            RuntimeError: If the version fails validation
+        """
+        if progress:
+            progress.set_phase("validating")
+        try:
+            self._validate_collection(version, expected_points)
+        except Exception:
+            self._discard_version(version)
+            raise
+        self.qdrant_client.update_collection_aliases(change_aliases_operations=[
+            models.CreateAliasOperation(create_alias=models.CreateAlias(
+                collection_name=version, alias_name=self._validated_marker(version)
+            ))
+        ])
+
+        if progress:
+            progress.set_phase("switching_alias")
+        self._switch_alias(version)
+        self._prune_versions()
+
+    def _discard_version(self, version: str) -> None:
+        """Delete a version that never went live."""
+        try:
+            self.qdrant_client.delete_collection(version)
+            logger.warning(f"Deleted index version '{version}' after a failed build.")
+        except Exception as e:
+            logger.error(f"Could not delete failed index version '{version}': {e}")
+
+    def rollback_index(self) -> str:
+        """
+        Point the live alias back at the previous validated version.
+
+        Returns:
+            Name of the collection that is live after the rollback
+
+        Raises:
+            RuntimeError: If there is no older version to roll back to
+        """
+        live = self.get_live_version()
+        older = [name for name in self.list_index_versions() if live is None or name < live]
+        if not older:
+            raise RuntimeError("No previous index version available for rollback")
+        self._switch_alias(older[-1])
+        return older[-1]
+
+    def _validate_collection(self, collection_name: str, expected_points: int) -> None:
+        """Check point count and that sample queries return results before going live."""
+        if expected_points == 0:
+            raise RuntimeError(f"Index version '{collection_name}' is empty")
+
+        # get_collection().points_count is only approximate; count exactly
+        points = self.qdrant_client.count(collection_name=collection_name, exact=True).count
+        if points != expected_points:
+            raise RuntimeError(
+                f"Index version '{collection_name}' has {points} points, expected {expected_points}"
+            )
+
+        for question in INDEX_VALIDATION_QUERIES:
+            results = self.qdrant_client.query_points(
+                collection_name=collection_name,
+                query=self.embeddings_model.embed_query(question),
+                limit=1,
+                with_payload=False
+            )
+            if not results.points:
+                raise RuntimeError(f"Index version '{collection_name}' returned no results for '{question}'")
+
+        logger.info(f"Index version '{collection_name}' validated with {expected_points} points.")
+
+    def _switch_alias(self, collection_name: str) -> None:
+        """Atomically move the live alias to collection_name."""
+        existing = {c.name for c in self.qdrant_client.get_collections().collections}
+        if QDRANT_COLLECTION in existing:
+            # Deployments from before versioning have a real collection under the
+            # alias name. It must go before the alias can be created - a one-off gap.
+            logger.warning(f"Replacing legacy collection '{QDRANT_COLLECTION}' with an alias.")
+            self.qdrant_client.delete_collection(QDRANT_COLLECTION)
+
+        actions = []
+        if self.get_live_version():
+            actions.append(models.DeleteAliasOperation(
+                delete_alias=models.DeleteAlias(alias_name=QDRANT_COLLECTION)
+            ))
+        actions.append(models.CreateAliasOperation(
+            create_alias=models.CreateAlias(collection_name=collection_name, alias_name=QDRANT_COLLECTION)
+        ))
+        # Both operations are applied in one request, so readers never see a missing alias
+        self.qdrant_client.update_collection_aliases(change_aliases_operations=actions)
+        logger.info(f"Alias '{QDRANT_COLLECTION}' now points to '{collection_name}'.")
+
+    def _prune_versions(self) -> None:
+        """Delete versions older than the live one beyond INDEX_VERSIONS_TO_KEEP."""
+        live = self.get_live_version()
+        older = [name for name in self.list_index_versions() if name != live and (live is None or name < live)]
+        stale = older[:-INDEX_VERSIONS_TO_KEEP] if INDEX_VERSIONS_TO_KEEP > 0 else older
+        for name in stale:
+            self.qdrant_client.delete_collection(name)
+            logger.info(f"Deleted old index version '{name}'.")
+
 indexing_service = IndexingService()
\ No newline at end of file
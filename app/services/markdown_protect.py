@@ -0,0 +1,153 @@
+"""
+Shield non-translatable Markdown/MDX spans from the translation provider.
+
+protect() replaces code, front matter, MDX/JSX syntax, LaTeX, link targets and
+URLs with compact placeholders (⟦0⟧, ⟦1⟧, ...) in a single regex pass, so the
+provider neither bills nor mangles them. restore() swaps them back in a
+single pass, tolerating whitespace the provider inserted inside a
+placeholder and re-inserting any placeholder it dropped next to the nearest
+surviving one.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+PLACEHOLDER_OPEN = "⟦"
+PLACEHOLDER_CLOSE = "⟧"
+
+# Lowercase tag names are only protected when they are HTML elements (or
+# custom elements, which contain a hyphen), so prose like "x<y and y>z" is not
+# taken for a tag; capitalized names are MDX components
+_HTML_TAGS = (
+    "a", "abbr", "article", "aside", "audio", "b", "blockquote", "br", "button", "caption", "center", "cite",
+    "code", "col", "colgroup", "dd", "del", "details", "dfn", "div", "dl", "dt", "em", "figcaption", "figure",
+    "font", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "i", "iframe", "img", "input", "ins",
+    "kbd", "label", "li", "main", "mark", "nav", "ol", "p", "path", "picture", "pre", "q", "s", "samp",
+    "section", "small", "source", "span", "strong", "sub", "summary", "sup", "svg", "table", "tbody", "td",
+    "tfoot", "th", "thead", "tr", "u", "ul", "var", "video", "wbr",
+)
+_TAG_NAME = rf"(?:[A-Z][\w.]*|[a-z][\w.]*-[\w.-]*|(?:{'|'.join(_HTML_TAGS)})(?![\w.:-]))"
+_TAG_ATTRIBUTE = (
+    r"""(?:[\w.:-]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|\{(?:[^{}]|\{[^{}]*\})*\}|[^\s"'=<>`{}]+))?"""
+    r"|\{\.\.\.[^{}]*\})"
+)
+
+# Alternatives are tried left to right at each position, so broader
+# constructs (fences, front matter, math blocks) come before the inline ones
+# they may contain.
+_PROTECTED_RE = re.compile("|".join([
+    r"(?P<front_matter>\A---[ \t]*\n.*?\n---[ \t]*(?=\n|\Z))",
+    r"(?P<fence>^[ \t]*(?P<fence_mark>`{3,}|~{3,}).*?(?:^[ \t]*(?P=fence_mark)[ \t]*$|\Z))",
+    r"(?P<math_block>\$\$.+?\$\$|\\\[.+?\\\])",
+    r"(?P<comment><!--.*?-->|\{/\*.*?\*/\})",
+    r"(?P<mdx_line>^[ \t]*(?:import|export)[ \t][^\n]*)",
+    r"(?P<ref_def>^[ \t]*\[[^\]\n]+\]:[ \t]*\S[^\n]*)",
+    r"(?P<inline_code>(?P<ticks>`+)(?:(?!(?P=ticks))[^\n])+(?P=ticks))",
+    r"(?P<math_inline>(?<![\\$])\$(?=\S)[^$\n]+?(?<=\S)\$(?!\d)|\\\([^\n]+?\\\))",
+    r"(?P<autolink><(?:https?|ftp|mailto):[^>\s]+>)",
+    rf"(?P<tag></?{_TAG_NAME}(?:\s+{_TAG_ATTRIBUTE})*\s*/?>)",
+    r"(?P<expression>\{[^{}\n]*\})",
+    r"(?P<link_target>\]\((?:[^()\s]|\([^()\s]*\))*(?:\s+\"[^\"\n]*\")?\))",
+    r"(?P<url>(?:https?|ftp)://[^\s<>()\[\]\"'`]*[^\s<>()\[\]\"'`.,;:!?])",
+    r"(?P<bracket>[⟦⟧])",
+]), re.MULTILINE | re.DOTALL)
+
+_BLOCK_KINDS = {"front_matter", "fence", "math_block", "mdx_line", "ref_def"}
+
+# Providers sometimes add spaces inside the brackets or around the number
+_PLACEHOLDER_RE = re.compile(r"⟦\s*(\d+)\s*⟧")
+_WORD_RE = re.compile(r"\w", re.UNICODE)
+
+
+@dataclass
+class ProtectedText:
+    text: str
+    source: str = ""
+    spans: List[str] = field(default_factory=list)
+    blocks: List[bool] = field(default_factory=list)
+
+    @property
+    def needs_translation(self) -> bool:
+        """False when nothing but placeholders, punctuation and whitespace is left."""
+        return bool(_WORD_RE.search(_PLACEHOLDER_RE.sub("", self.text)))
+
+
+def placeholder(index: int) -> str:
+    return f"{PLACEHOLDER_OPEN}{index}{PLACEHOLDER_CLOSE}"
+
+
+def protect(text: str) -> ProtectedText:
+    """Replace every non-translatable span with a numbered placeholder."""
+    protected = ProtectedText(text="", source=text)
+
+    def substitute(match: re.Match) -> str:
+        protected.spans.append(match.group(0))
+        protected.blocks.append(match.lastgroup in _BLOCK_KINDS or "\n" in match.group(0))
+        return placeholder(len(protected.spans) - 1)
+
+    protected.text = _PROTECTED_RE.sub(substitute, text)
+    return protected
+
+
+def restore(translated: str, protected: ProtectedText, repair: bool = True) -> Tuple[str, List[int]]:
+    """
+    Put the protected spans back into a translation.
+
+    Placeholders the provider dropped are re-inserted next to the nearest
+    surviving placeholder: right after it if it preceded them in the
+    source, right before it if it followed them. If none survived there is
+    nothing to anchor them to, and the untranslated source is returned
+    instead, so code and links are never lost or misplaced. Placeholders
+    with unknown numbers are removed. Pass repair=False for partial
+    (streamed) text, where missing placeholders may still arrive.
+
+    Returns:
+        Tuple of (restored text, indices of repaired placeholders); when
+        every placeholder was dropped, all indices are returned with the source
+    """
+    spans = protected.spans
+    if not spans:
+        return translated, []
+
+    pieces: List[str] = []
+    length = 0
+    span_start = {}  # span index -> offsets in the restored text
+    span_end = {}
+    pos = 0
+    for match in _PLACEHOLDER_RE.finditer(translated):
+        pieces.append(translated[pos:match.start()])
+        length += match.start() - pos
+        index = int(match.group(1))
+        if index < len(spans):
+            pieces.append(spans[index])
+            if index not in span_end:
+                span_start[index], span_end[index] = length, length + len(spans[index])
+            length += len(spans[index])
+        pos = match.end()
+    pieces.append(translated[pos:])
+    result = "".join(pieces)
+
+    missing = [index for index in range(len(spans)) if index not in span_end] if repair else []
+    if missing and not span_end:
+        return protected.source, missing
+
+    for index in missing:
+        preceding = max((i for i in span_end if i < index), default=None)
+        following = min((i for i in span_end if i > index), default=None)
+        after = following is None or (preceding is not None and index - preceding <= following - index)
+        at = span_end[preceding] if after else span_start[following]
+        if protected.blocks[index]:
+            prefix, suffix = ("\n" if at and result[at - 1] != "\n" else ""), "\n"
+        else:
+            prefix, suffix = (" ", "") if after else ("", " ")
+        result = result[:at] + prefix + spans[index] + suffix + result[at:]
+        inserted = len(prefix) + len(spans[index]) + len(suffix)
+        for i in span_end:
+            if span_start[i] >= at:
+                span_start[i] += inserted
+            if span_end[i] > at:
+                span_end[i] += inserted
+        span_start[index] = at + len(prefix)
+        span_end[index] = span_start[index] + len(spans[index])
+
+    return result, missing
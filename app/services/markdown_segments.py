@@ -0,0 +1,134 @@
+"""
+Split Markdown/MDX chapters into stable segments for translation.
+
+Every character of the input ends up in exactly one segment, so
+"".join(segment.text for segment in segments) reproduces the document.
+Structural syntax (front matter, code fences, heading/list/quote markers,
+table pipes, MDX imports and tag-only lines, blank lines) goes into
+non-translatable segments; headings, paragraphs, list items and table cells
+become translatable segments whose hashes stay the same when an unrelated
+part of the chapter is edited.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_HEADING_RE = re.compile(r"^(\s*#{1,6}\s+)(.*)$")
+_LIST_RE = re.compile(r"^(\s*(?:[-*+]|\d+[.)])\s+(?:\[[ xX]\]\s+)?)(.*)$")
+_QUOTE_RE = re.compile(r"^(\s*(?:>\s?)+)(.*)$")
+_TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?\s*$")
+_MDX_LINE_RE = re.compile(r"^\s*(import\s|export\s|</?[A-Za-z][^>]*>\s*$|\{/\*.*\*/\}\s*$)")
+_WORD_RE = re.compile(r"\w", re.UNICODE)
+
+
+@dataclass
+class Segment:
+    text: str
+    translatable: bool
+
+
+class _Builder:
+    def __init__(self):
+        self.segments: List[Segment] = []
+
+    def raw(self, text: str) -> None:
+        if not text:
+            return
+        if self.segments and not self.segments[-1].translatable:
+            self.segments[-1].text += text
+        else:
+            self.segments.append(Segment(text, False))
+
+    def text(self, text: str) -> None:
+        """Add translatable text, keeping surrounding whitespace out of the segment."""
+        stripped = text.strip()
+        if not stripped or not _WORD_RE.search(stripped):
+            self.raw(text)
+            return
+        start = text.index(stripped)
+        self.raw(text[:start])
+        self.segments.append(Segment(stripped, True))
+        self.raw(text[start + len(stripped):])
+
+
+def _table_row(builder: _Builder, line: str) -> None:
+    for i, cell in enumerate(line.split("|")):
+        if i:
+            builder.raw("|")
+        builder.text(cell)
+
+
+def split_markdown(text: str) -> List[Segment]:
+    """Split a Markdown/MDX document into translatable and structural segments."""
+    builder = _Builder()
+    lines = text.splitlines(keepends=True)
+    i = 0
+
+    # Front matter
+    if lines and lines[0].rstrip("\r\n") == "---":
+        for j in range(1, len(lines)):
+            if lines[j].rstrip("\r\n") in ("---", "..."):
+                builder.raw("".join(lines[:j + 1]))
+                i = j + 1
+                break
+
+    paragraph: List[str] = []
+
+    def flush_paragraph():
+        if paragraph:
+            body = "".join(paragraph)
+            content = body.rstrip("\r\n")
+            builder.text(content)
+            builder.raw(body[len(content):])
+            paragraph.clear()
+
+    while i < len(lines):
+        line = lines[i]
+        content = line.rstrip("\r\n")
+        newline = line[len(content):]
+
+        fence = _FENCE_RE.match(content)
+        if fence:
+            flush_paragraph()
+            marker = fence.group(1)
+            j = i + 1
+            while j < len(lines) and not lines[j].lstrip().startswith(marker):
+                j += 1
+            builder.raw("".join(lines[i:j + 1]))
+            i = j + 1
+            continue
+
+        if not content.strip() or _MDX_LINE_RE.match(content) or ("|" in content and _TABLE_SEPARATOR_RE.match(content)):
+            flush_paragraph()
+            builder.raw(line)
+        elif content.lstrip().startswith("|"):
+            flush_paragraph()
+            _table_row(builder, content)
+            builder.raw(newline)
+        else:
+            structural = _HEADING_RE.match(content) or _LIST_RE.match(content) or _QUOTE_RE.match(content)
+            if structural:
+                flush_paragraph()
+                builder.raw(structural.group(1))
+                builder.text(structural.group(2))
+                builder.raw(newline)
+            else:
+                paragraph.append(line)
+        i += 1
+
+    flush_paragraph()
+    return builder.segments
+
+
+def reassemble(segments: List[Segment], translations: Dict[str, str]) -> str:
+    """Join segments, substituting translations for translatable segment texts."""
+    return "".join(
+        translations.get(segment.text, segment.text) if segment.translatable else segment.text
+        for segment in segments
+    )
+
+
+def translatable_texts(segments: List[Segment]) -> List[str]:
+    """Distinct translatable segment texts in document order."""
+    return list(dict.fromkeys(segment.text for segment in segments if segment.translatable))
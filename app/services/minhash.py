@@ -0,0 +1,88 @@
+"""
+MinHash signatures and banded LSH for near-duplicate text detection.
+"""
+import hashlib
+import re
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def word_shingles(text: str, k: int = 3) -> Set[str]:
+    """Lower-cased word k-grams; short texts fall back to their whole word sequence."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def char_shingles(text: str, k: int = 4) -> Set[str]:
+    """Character k-grams over whitespace-collapsed, lower-cased text."""
+    normalized = " ".join(text.lower().split())
+    if len(normalized) <= k:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+
+class MinHasher:
+    """Computes fixed-length MinHash signatures with seeded universal hashing."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def signature(self, shingles: Iterable[str]) -> np.ndarray:
+        values = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+            dtype=np.uint64,
+        )
+        if values.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        # uint64 wrap-around is intentional; it is part of the hash family
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(self._a, values) + self._b[:, None]) % _MERSENNE_PRIME
+        return np.bitwise_and(permuted, _MAX_HASH).min(axis=1)
+
+
+def estimate_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures.
+
+    With b bands of r rows, two texts of Jaccard similarity s collide in at
+    least one band with probability 1 - (1 - s^r)^b. Candidates should still be
+    confirmed with estimate_jaccard.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [dict() for _ in range(bands)]
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def insert(self, key: Hashable, signature: np.ndarray) -> None:
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def query(self, signature: np.ndarray) -> List[Hashable]:
+        """Candidate keys sharing at least one band, in insertion order of first match."""
+        seen: Dict[Hashable, None] = {}
+        for band, band_key in self._band_keys(signature):
+            for key in self._buckets[band].get(band_key, ()):
+                seen.setdefault(key, None)
+        return list(seen)
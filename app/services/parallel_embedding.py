@@ -0,0 +1,125 @@
+"""
+Multi-process embedding for full index builds.
+
+The chunk list is split into contiguous shards that are embedded by a pool of
+worker processes. Each worker loads the embedding model once (in the pool
+initializer) and writes its vectors straight into a shared-memory matrix at
+the shard's offset, so results come back in input order without pickling
+vectors through the result queue.
+
+This module is imported by spawned workers, so it must stay free of heavy
+imports and service singletons.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import get_logger
+
+logger = get_logger(__name__)
+
+# Shards per worker; more shards smooth out uneven chunk lengths.
+SHARDS_PER_WORKER = 4
+
+# Per-process state populated by _init_worker
+_worker_model = None
+_worker_shm = None
+_worker_matrix = None
+
+
+def resolve_worker_count(workers: int) -> int:
+    """Translate the configured worker count (0 = one per CPU core) into a real count."""
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _init_worker(model_name: str, shm_name: str, shape: Tuple[int, int]) -> None:
+    """Load the embedding model once per worker and attach to the output matrix."""
+    global _worker_model, _worker_shm, _worker_matrix
+
+    # Each worker owns one core; letting torch spawn its own thread pool in
+    # every process oversubscribes the machine.
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    _worker_model = HuggingFaceEmbeddings(model_name=model_name)
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_matrix = np.ndarray(shape, dtype=np.float32, buffer=_worker_shm.buf)
+
+
+def _embed_shard(start: int, texts: List[str], batch_size: int) -> Tuple[int, int]:
+    """Embed one shard and write its vectors into the shared matrix."""
+    for offset in range(0, len(texts), batch_size):
+        batch = texts[offset:offset + batch_size]
+        vectors = _worker_model.embed_documents(batch)
+        row = start + offset
+        _worker_matrix[row:row + len(batch)] = np.asarray(vectors, dtype=np.float32)
+    return start, len(texts)
+
+
+def embed_in_process_pool(
+    texts: List[str],
+    model_name: str,
+    dimension: int,
+    workers: int,
+    batch_size: int,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> np.ndarray:
+    """
+    Embed texts across a pool of worker processes.
+
+    Args:
+        texts: Texts to embed, in index order
+        model_name: HuggingFace model name loaded by every worker
+        dimension: Embedding dimension of the model
+        workers: Number of worker processes
+        batch_size: Texts per model call inside a worker
+        on_progress: Optional callback receiving the number of texts finished per shard
+
+    Returns:
+        float32 matrix of shape (len(texts), dimension), rows aligned with texts
+    """
+    count = len(texts)
+    if count == 0:
+        return np.zeros((0, dimension), dtype=np.float32)
+
+    workers = max(1, min(workers, count))
+    shard_size = max(batch_size, -(-count // (workers * SHARDS_PER_WORKER)))
+    shards = [(start, texts[start:start + shard_size]) for start in range(0, count, shard_size)]
+
+    shape = (count, dimension)
+    shm = shared_memory.SharedMemory(create=True, size=count * dimension * np.dtype(np.float32).itemsize)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+
+        # spawn rather than fork: forking a process that already holds torch
+        # thread pools can deadlock the children.
+        context = multiprocessing.get_context("spawn")
+        logger.info(f"Embedding {count} chunks with {workers} worker processes in {len(shards)} shards.")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(model_name, shm.name, shape),
+        ) as pool:
+            futures = [pool.submit(_embed_shard, start, shard, batch_size) for start, shard in shards]
+            for future in as_completed(futures):
+                _, done = future.result()
+                if on_progress:
+                    on_progress(done)
+
+        # Copy out before the shared segment is released
+        return matrix.copy()
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,267 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    get_logger, SessionLocal, TRANSLATION_GLOSSARY_VERSION, PRETRANSLATION_LANGUAGES,
+    PRETRANSLATION_STATE_PATH, TRANSLATION_GOOGLE_COST_PER_MILLION_CHARS,
+    TRANSLATION_OPENAI_COST_PER_MILLION_CHARS
+)
+from app.services.docs_source import resolve_docs_path, iter_doc_files, read_doc_text
+from app.services.translation_cache import translation_cache, content_hash
+from app.services.translation_service import translation_service, language_names
+
+logger = get_logger(__name__)
+
+COST_PER_MILLION_CHARS = {
+    "google": TRANSLATION_GOOGLE_COST_PER_MILLION_CHARS,
+    "openai": TRANSLATION_OPENAI_COST_PER_MILLION_CHARS,
+    "mock": 0.0,
+}
+
+
+def target_languages(languages: Optional[List[str]] = None) -> List[str]:
+    """Requested languages, else PRETRANSLATION_LANGUAGES, else every language the service knows."""
+    return list(languages or PRETRANSLATION_LANGUAGES or language_names)
+
+
+def estimate_cost(characters: int, provider: str) -> float:
+    """Estimated provider cost in USD for translating this many source characters."""
+    return round(characters / 1_000_000 * COST_PER_MILLION_CHARS.get(provider, 0.0), 4)
+
+
+@dataclass
+class PretranslationProgress:
+    """Progress of one pre-translation run."""
+    job_id: str = field(default_factory=lambda: str(uuid4()))
+    status: str = "pending"  # pending, running, completed, failed
+    provider: str = ""
+    languages: List[str] = field(default_factory=list)
+    dry_run: bool = False
+    chapters_total: int = 0
+    chapters_translated: int = 0
+    chapters_skipped: int = 0
+    chapters_failed: int = 0
+    characters_pending: int = 0
+    characters_translated: int = 0
+    errors: List[str] = field(default_factory=list)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    _started_monotonic: Optional[float] = None
+    _finished_monotonic: Optional[float] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ("pending", "running")
+
+    def to_dict(self) -> Dict:
+        end = self._finished_monotonic or time.monotonic()
+        elapsed = end - self._started_monotonic if self._started_monotonic else 0.0
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "provider": self.provider,
+            "languages": self.languages,
+            "dry_run": self.dry_run,
+            "chapters_total": self.chapters_total,
+            "chapters_translated": self.chapters_translated,
+            "chapters_skipped": self.chapters_skipped,
+            "chapters_failed": self.chapters_failed,
+            "characters_pending": self.characters_pending,
+            "characters_translated": self.characters_translated,
+            # Upper bound: segments already in the cache are not billed again
+            "estimated_cost_usd": estimate_cost(self.characters_pending, self.provider),
+            "spent_cost_usd": estimate_cost(self.characters_translated, self.provider),
+            "elapsed_seconds": round(elapsed, 2),
+            "errors": list(self.errors),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class PretranslationService:
+    """
+    Pre-translates every chapter of the book into the translation cache.
+
+    Chapters are read from the same docs tree the indexer uses. A chapter is
+    skipped when the cache already holds its whole-document translation for
+    the current content hash and glossary version from any configured
+    provider, so re-running the job (including after an interruption) only
+    pays for chapters that changed or were not finished. The cache is the
+    only source of truth for skipping.
+
+    Finished chapters are also appended to a JSON state file
+    (PRETRANSLATION_STATE_PATH). It is an audit log of what was translated,
+    when and by which provider, and is never read to decide what to do.
+    """
+
+    def __init__(self, state_path: str = PRETRANSLATION_STATE_PATH):
+        self.state_path = state_path
+        self._current: Optional[PretranslationProgress] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _load_state(self) -> Dict:
+        """Existing audit log, so a run adds to it rather than replacing it."""
+        if self.state_path and os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable pre-translation state {self.state_path}: {e}")
+        return {"chapters": {}}
+
+    def _save_state(self, state: Dict) -> None:
+        if not self.state_path:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def plan(self, db: Session, docs_path: Optional[str] = None,
+             languages: Optional[List[str]] = None) -> List[Dict]:
+        """
+        List the chapter translations that are still missing.
+
+        Returns:
+            Work items with source_file, path, language, content_hash and characters
+        """
+        root = resolve_docs_path(docs_path)
+        if root is None:
+            raise RuntimeError("Docs directory not found")
+
+        providers = translation_service.available_providers
+        work = []
+        for file_path in iter_doc_files(root):
+            text = read_doc_text(file_path)
+            if not text.strip():
+                continue
+            digest = content_hash(text)
+            for language in target_languages(languages):
+                work.append({
+                    "source_file": file_path.relative_to(root).as_posix(),
+                    "path": file_path,
+                    "language": language,
+                    "content_hash": digest,
+                    "characters": len(text),
+                    "cached": bool(providers) and translation_cache.contains(db, digest, language, providers),
+                })
+        return work
+
+    async def run(self, db: Session, docs_path: Optional[str] = None, languages: Optional[List[str]] = None,
+                  dry_run: bool = False, progress: Optional[PretranslationProgress] = None) -> PretranslationProgress:
+        """
+        Translate every chapter missing from the cache.
+
+        Args:
+            db: Database session
+            docs_path: Docs directory override
+            languages: Target language codes (see target_languages)
+            dry_run: Only plan and estimate the cost; translate nothing
+            progress: Progress object to report to (created if omitted)
+
+        Returns:
+            The final progress
+        """
+        progress = progress or PretranslationProgress()
+        progress.status = "running"
+        progress.started_at = datetime.utcnow()
+        progress._started_monotonic = time.monotonic()
+        progress.provider = translation_service.active_provider
+        progress.languages = target_languages(languages)
+        progress.dry_run = dry_run
+
+        try:
+            if progress.provider == "mock" and not dry_run:
+                raise RuntimeError("No translation provider configured")
+
+            work = self.plan(db, docs_path, languages)
+            progress.chapters_total = len(work)
+            progress.chapters_skipped = sum(1 for item in work if item["cached"])
+            progress.characters_pending = sum(item["characters"] for item in work if not item["cached"])
+            logger.info(
+                f"Pre-translation: {progress.chapters_total - progress.chapters_skipped} of "
+                f"{progress.chapters_total} chapter translations to do, ~{progress.characters_pending} characters, "
+                f"estimated ${estimate_cost(progress.characters_pending, progress.provider)}."
+            )
+
+            if not dry_run:
+                state = self._load_state()
+                for item in work:
+                    if item["cached"]:
+                        continue
+                    await self._translate_chapter(db, item, progress, state)
+        except Exception as e:
+            logger.error(f"Pre-translation failed: {e}")
+            progress.errors.append(str(e))
+            progress.status = "failed"
+        else:
+            progress.status = "completed" if not progress.chapters_failed else "failed"
+        progress.finished_at = datetime.utcnow()
+        progress._finished_monotonic = time.monotonic()
+        return progress
+
+    async def _translate_chapter(self, db: Session, item: Dict, progress: PretranslationProgress, state: Dict) -> None:
+        key = f"{item['language']}:{item['source_file']}"
+        text = read_doc_text(item["path"])
+        translated, _ = await translation_service.translate_document(
+            db, text, item["language"], source_file=item["source_file"]
+        )
+        if translated is None:
+            progress.chapters_failed += 1
+            progress.errors.append(f"{key}: translation failed")
+            return
+
+        progress.chapters_translated += 1
+        progress.characters_translated += item["characters"]
+        state["chapters"][key] = {
+            "content_hash": item["content_hash"],
+            "provider": progress.provider,
+            "glossary_version": TRANSLATION_GLOSSARY_VERSION,
+            "characters": item["characters"],
+            "translated_at": datetime.utcnow().isoformat(),
+        }
+        self._save_state(state)
+        logger.info(f"Pre-translated {key} ({progress.chapters_translated} done).")
+
+    def start(self, docs_path: Optional[str] = None, languages: Optional[List[str]] = None,
+              dry_run: bool = False) -> Tuple[PretranslationProgress, bool]:
+        """
+        Start a background run on the current event loop, or join the active one.
+
+        The run shares the application's loop (and thus its provider gates)
+        instead of getting its own thread, so it queues behind reader traffic
+        rather than competing with it.
+
+        Returns:
+            Tuple of (progress, whether a new run was started)
+        """
+        if self._current and self._current.is_active:
+            return self._current, False
+
+        progress = PretranslationProgress()
+        self._current = progress
+        self._task = asyncio.get_running_loop().create_task(self._run_job(progress, docs_path, languages, dry_run))
+        return progress, True
+
+    async def _run_job(self, progress: PretranslationProgress, docs_path: Optional[str],
+                       languages: Optional[List[str]], dry_run: bool) -> None:
+        db = SessionLocal()
+        try:
+            await self.run(db, docs_path, languages, dry_run, progress)
+        finally:
+            db.close()
+
+    def latest(self) -> Optional[PretranslationProgress]:
+        return self._current
+
+
+# Singleton instance of the service
+pretranslation_service = PretranslationService()
@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
 
+from app.core.session_cache import session_cache
 from app.models import UserProfile
 
 
@@ -46,6 +47,7 @@ class ProfileService:
         db.add(profile)
         db.commit()
         db.refresh(profile)
+        session_cache.invalidate_user(user_id)
 
         return profile
 
@@ -98,5 +100,6 @@ class ProfileService:
         profile.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(profile)
+        session_cache.invalidate_user(user_id)
 
         return profile
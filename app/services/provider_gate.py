@@ -0,0 +1,153 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from app.core.config import (
+    get_logger, TRANSLATION_EXECUTOR_THREADS,
+    TRANSLATION_GOOGLE_CONCURRENCY, TRANSLATION_GOOGLE_REQUESTS_PER_MINUTE,
+    TRANSLATION_OPENAI_CONCURRENCY, TRANSLATION_OPENAI_REQUESTS_PER_MINUTE
+)
+
+logger = get_logger(__name__)
+
+# Blocking provider SDK calls run here, never on the event loop or the default executor
+_executor = ThreadPoolExecutor(max_workers=TRANSLATION_EXECUTOR_THREADS, thread_name_prefix="translation")
+
+
+class TokenBucket:
+    """Async token bucket; waiters are served in arrival order."""
+
+    def __init__(self, requests_per_minute: float, burst: int):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting for a refill if necessary.
+
+        Returns:
+            Seconds spent waiting for the rate limit
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class ProviderGate:
+    """
+    Admission control for one translation provider.
+
+    Calls wait for a concurrency slot and a rate-limit token, then run on the
+    translation thread pool. A burst of requests therefore queues here instead
+    of blocking the event loop, and the queue depth is visible in metrics().
+
+    The semaphore and bucket bind to the application's event loop; run gated
+    calls from that loop (or from a separate process with its own loop).
+    """
+
+    def __init__(self, name: str, concurrency: int, requests_per_minute: float):
+        self.name = name
+        self.concurrency = max(concurrency, 1)
+        self.requests_per_minute = requests_per_minute
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._bucket = TokenBucket(requests_per_minute, burst=self.concurrency)
+
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.queue_wait_seconds = 0.0
+        self.rate_limit_wait_seconds = 0.0
+        self.call_seconds = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking provider call once a slot and a token are available.
+
+        Args:
+            fn: Blocking SDK function, e.g. google_client.translate
+            *args, **kwargs: Passed through to fn
+
+        Returns:
+            fn's return value (exceptions propagate unchanged)
+        """
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        enqueued = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        try:
+            self.queue_wait_seconds += time.monotonic() - enqueued
+            self.rate_limit_wait_seconds += await self._bucket.acquire()
+            future = asyncio.get_running_loop().run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        # The slot is released when the worker thread finishes, not when the
+        # caller stops waiting: a cancelled call (e.g. a losing hedge) keeps
+        # running in its thread and still counts against the concurrency cap
+        self.in_flight += 1
+        started = time.monotonic()
+        future.add_done_callback(functools.partial(self._finish, started=started))
+        return await asyncio.shield(future)
+
+    def _finish(self, future: asyncio.Future, started: float) -> None:
+        self.in_flight -= 1
+        self.call_seconds += time.monotonic() - started
+        if future.cancelled() or future.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+        self._semaphore.release()
+
+    def metrics(self) -> Dict:
+        calls = self.completed + self.failed
+        return {
+            "concurrency": self.concurrency,
+            "requests_per_minute": self.requests_per_minute,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_queue_wait_seconds": round(self.queue_wait_seconds / calls, 4) if calls else 0.0,
+            "avg_call_seconds": round(self.call_seconds / calls, 4) if calls else 0.0,
+            "rate_limit_wait_seconds": round(self.rate_limit_wait_seconds, 3),
+        }
+
+
+# One gate per provider, shared by every request
+provider_gates: Dict[str, ProviderGate] = {
+    "google": ProviderGate("google", TRANSLATION_GOOGLE_CONCURRENCY, TRANSLATION_GOOGLE_REQUESTS_PER_MINUTE),
+    "openai": ProviderGate("openai", TRANSLATION_OPENAI_CONCURRENCY, TRANSLATION_OPENAI_REQUESTS_PER_MINUTE),
+}
+
+
+def provider_metrics() -> Dict:
+    """Queue and throughput metrics for every provider gate."""
+    return {
+        "executor_threads": TRANSLATION_EXECUTOR_THREADS,
+        "providers": {name: gate.metrics() for name, gate in provider_gates.items()},
+    }
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from app.core.config import (
+    get_logger, TRANSLATION_ROUTER_WINDOW, TRANSLATION_HEDGING_ENABLED,
+    TRANSLATION_HEDGE_DEFAULT_DELAY_MS, TRANSLATION_HEDGE_MIN_DELAY_MS
+)
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Latencies are normalized to this many source characters, so one window
+# covers both single segments and large batches
+_LATENCY_UNIT_CHARS = 1000
+
+# Samples needed before a provider's own p95 is trusted for hedging
+MIN_SAMPLES_FOR_P95 = 5
+
+# Consecutive failures after which a provider is skipped for a while
+CIRCUIT_BREAKER_FAILURES = 3
+CIRCUIT_BREAKER_COOLDOWN_SECONDS = 30.0
+
+
+def _units(characters: int) -> float:
+    return max(1.0, characters / _LATENCY_UNIT_CHARS)
+
+
+class ProviderHealth:
+    """Rolling latency and error window for one provider."""
+
+    def __init__(self, name: str, window: int = TRANSLATION_ROUTER_WINDOW):
+        self.name = name
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=window)  # (seconds per unit, ok)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.calls = 0
+        self.wins = 0
+        self.hedges_started = 0
+        self.cancelled = 0
+
+    def record(self, seconds: float, characters: int, ok: bool) -> None:
+        self.calls += 1
+        self._samples.append((seconds / _units(characters), ok))
+        if ok:
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= CIRCUIT_BREAKER_FAILURES:
+                self.open_until = time.monotonic() + CIRCUIT_BREAKER_COOLDOWN_SECONDS
+                logger.warning(f"Translation provider {self.name} failed {self.consecutive_failures} times in a row; "
+                               f"deprioritizing it for {CIRCUIT_BREAKER_COOLDOWN_SECONDS:.0f}s.")
+
+    @property
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Seconds per 1000 characters at the given percentile of successful calls."""
+        latencies = sorted(seconds for seconds, ok in self._samples if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(percentile * len(latencies)))]
+
+    @property
+    def circuit_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def score(self) -> Tuple[bool, float]:
+        """Sort key, lower is healthier: open circuit last, then median latency inflated by the error rate."""
+        median = self.latency_percentile(0.5)
+        if median is None:
+            # No successes yet: untried providers rank first, only-failing ones last
+            return self.circuit_open, float("inf") if self.error_rate > 0 else 0.0
+        return self.circuit_open, median * (1 + 10 * self.error_rate)
+
+    def hedge_delay(self, characters: int) -> float:
+        p95 = self.latency_percentile(0.95)
+        ok_samples = sum(1 for _, ok in self._samples if ok)
+        if p95 is None or ok_samples < MIN_SAMPLES_FOR_P95:
+            return TRANSLATION_HEDGE_DEFAULT_DELAY_MS / 1000
+        return max(TRANSLATION_HEDGE_MIN_DELAY_MS / 1000, p95 * _units(characters))
+
+    def to_dict(self) -> Dict:
+        p50, p95 = self.latency_percentile(0.5), self.latency_percentile(0.95)
+        return {
+            "samples": len(self._samples),
+            "error_rate": round(self.error_rate, 4),
+            "p50_seconds_per_1k_chars": round(p50, 4) if p50 is not None else None,
+            "p95_seconds_per_1k_chars": round(p95, 4) if p95 is not None else None,
+            "circuit_open": self.circuit_open,
+            "calls": self.calls,
+            "wins": self.wins,
+            "hedges_started": self.hedges_started,
+            "cancelled": self.cancelled,
+        }
+
+
+class ProviderRouter:
+    """
+    Sends each translation call to the healthier provider.
+
+    Providers are ordered by a score built from their rolling median latency
+    and error rate. A failed call falls over to the next provider. With
+    hedging enabled, a call that is still running after the primary's p95
+    latency (scaled to the request size) starts the next provider as well;
+    the first successful answer wins and the other call is cancelled. The
+    blocking SDK request of a cancelled call finishes in its worker thread,
+    holding its provider gate slot until then, but its result is discarded.
+    """
+
+    def __init__(self, providers: List[str], hedging: bool = TRANSLATION_HEDGING_ENABLED):
+        self.health: Dict[str, ProviderHealth] = {name: ProviderHealth(name) for name in providers}
+        self.hedging = hedging
+
+    def order(self, available: List[str]) -> List[str]:
+        """Available providers, healthiest first (ties keep the given order)."""
+        return sorted(available, key=lambda name: self.health[name].score())
+
+    def record(self, name: str, seconds: float, characters: int, ok: bool) -> None:
+        """Record a call made outside call(), e.g. a streamed completion."""
+        self.health[name].record(seconds, characters, ok)
+
+    async def _timed(self, name: str, call: Callable[[], Awaitable[T]], characters: int) -> T:
+        started = time.monotonic()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            self.health[name].cancelled += 1
+            raise
+        except Exception:
+            self.health[name].record(time.monotonic() - started, characters, ok=False)
+            raise
+        self.health[name].record(time.monotonic() - started, characters, ok=True)
+        return result
+
+    async def call(self, calls: Dict[str, Callable[[], Awaitable[T]]], characters: int) -> Tuple[T, str]:
+        """
+        Run one logical request against the best provider.
+
+        Args:
+            calls: Provider name -> coroutine factory performing the request with that provider
+            characters: Source characters in the request, used to scale latency
+
+        Returns:
+            Tuple of (result, name of the provider that produced it)
+
+        Raises:
+            Exception: The last provider error if every provider failed
+        """
+        order = self.order(list(calls))
+        running: Dict[asyncio.Task, str] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch(name: str) -> None:
+            running[asyncio.ensure_future(self._timed(name, calls[name], characters))] = name
+
+        launch(order[0])
+        remaining = order[1:]
+        try:
+            while running:
+                timeout = None
+                if self.hedging and remaining and len(running) == 1:
+                    timeout = self.health[next(iter(running.values()))].hedge_delay(characters)
+
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    name = remaining.pop(0)
+                    self.health[name].hedges_started += 1
+                    logger.info(f"Hedging slow translation request with {name}.")
+                    launch(name)
+                    continue
+
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is None:
+                        self.health[name].wins += 1
+                        return task.result(), name
+                    last_error = task.exception()
+                    logger.warning(f"Translation provider {name} failed: {last_error}")
+
+                if not running and remaining:
+                    launch(remaining.pop(0))
+        finally:
+            for task in running:
+                task.cancel()
+
+        raise last_error
+
+    def metrics(self) -> Dict:
+        return {
+            "hedging": self.hedging,
+            "providers": {name: health.to_dict() for name, health in self.health.items()},
+        }
+
+
+# Singleton router shared by every translation request
+provider_router = ProviderRouter(["google", "openai"])
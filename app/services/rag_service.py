@@ -1,8 +1,9 @@
 import os
 from typing import List, Tuple, Optional
-from app.core.config import get_logger
+from app.core.config import get_logger, EMBEDDING_MODEL_NAME, QDRANT_COLLECTION, INDEX_SNAPSHOT_PATH
 from app.models import Message, Conversation, UserProfile
 from app.services.indexing_service import indexing_service
+from app.services.index_snapshot import LocalIndex
 from app.services.personalization_service import PersonalizationService
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from qdrant_client import QdrantClient
@@ -14,13 +15,15 @@ logger = get_logger(__name__)
 
 class RAGService:
     def __init__(self):
-        self.embeddings_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+        self.embeddings_model = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME)
         self.qdrant_client = QdrantClient(
             url=os.getenv("QDRANT_URL"),
             api_key=os.getenv("QDRANT_API_KEY"),
             prefer_grpc=False
         )
         self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # A local snapshot, when configured, replaces Qdrant for retrieval
+        self.local_index = LocalIndex(INDEX_SNAPSHOT_PATH) if INDEX_SNAPSHOT_PATH else None
         logger.info("RAGService initialized.")
 
     async def query_rag_pipeline(self, question: str, context: str = None, conversation_id: UUID = None, user_profile: Optional[UserProfile] = None) -> Tuple[str, List[dict]]:
@@ -48,9 +51,10 @@ class RAGService:
         query_vector = self.embeddings_model.embed_query(question)
         logger.debug("Question embedded.")
 
-        # 2. Query Qdrant for similar content
-        search_results = self.qdrant_client.query_points(
-            collection_name="book_content",
+        # 2. Query Qdrant (or the local snapshot) for similar content
+        search_backend = self.local_index if self.local_index is not None else self.qdrant_client
+        search_results = search_backend.query_points(
+            collection_name=QDRANT_COLLECTION,
             query=query_vector,
             limit=5,  # Increase to 5 for more context
             with_payload=True,
@@ -248,23 +252,34 @@ class RAGService:
             "the book directly. Be helpful and maintain a friendly tone."
         )
 
-    async def index_book_content_if_needed(self):
+    async def index_book_content_if_needed(self, progress=None, force: bool = False):
         """
         Check if book content is indexed, and if not, index it.
+
+        Builds always go into a new versioned collection and the live alias is
+        switched only after validation, so readers never see a partial index.
+
+        Args:
+            progress: Optional IndexingProgress updated while indexing runs
+            force: Rebuild even if the live index already has content
         """
         try:
             # Check if collection exists and has content
-            collection_info = self.qdrant_client.get_collection("book_content")
-            if collection_info.points_count == 0:
-                logger.info("Book content not found in vector store. Starting indexing process...")
-                await indexing_service.index_book_content()
-                logger.info("Book content indexing completed.")
-            else:
-                logger.info(f"Book content already indexed with {collection_info.points_count} chunks.")
+            collection_info = self.qdrant_client.get_collection(QDRANT_COLLECTION)
+            points_count = collection_info.points_count
         except Exception as e:
-            logger.error(f"Error checking/indexing book content: {e}")
-            # If collection doesn't exist, create and index it
-            await indexing_service.index_book_content()
+            logger.info(f"Live index '{QDRANT_COLLECTION}' not available ({e}); building it.")
+            points_count = 0
+
+        if points_count and not force:
+            logger.info(f"Book content already indexed with {points_count} chunks.")
+            if progress:
+                progress.set_phase("already_indexed")
+            return
+
+        logger.info("Starting indexing process...")
+        version = await indexing_service.rebuild_index(progress=progress)
+        logger.info(f"Book content indexing completed; live version is '{version}'.")
 
 # Singleton instance of the service
 rag_service = RAGService()
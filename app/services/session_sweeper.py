@@ -0,0 +1,161 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    get_logger, SessionLocal, SESSION_SWEEP_INTERVAL_SECONDS, SESSION_SWEEP_BATCH_SIZE, SESSION_MAX_PER_USER
+)
+from app.core.session_cache import session_cache
+from app.models import Session as SessionModel, RevokedToken
+
+logger = get_logger(__name__)
+
+
+class SessionSweeper:
+    """
+    Periodically removes expired sessions and caps sessions per user.
+
+    Expired rows are found through the expires_at index and deleted in
+    batches of SESSION_SWEEP_BATCH_SIZE, each in its own transaction, so a
+    large backlog never holds long locks on the sessions table. Users with
+    more than SESSION_MAX_PER_USER sessions lose their oldest ones, and
+    revocations of access tokens that have expired anyway are pruned. Every
+    worker may run a sweeper; the deletes are idempotent.
+    """
+
+    def __init__(self, interval_seconds: int = SESSION_SWEEP_INTERVAL_SECONDS,
+                 batch_size: int = SESSION_SWEEP_BATCH_SIZE, max_per_user: int = SESSION_MAX_PER_USER):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_per_user = max_per_user
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self.runs = 0
+        self.expired_removed = 0
+        self.capped_removed = 0
+        self.revocations_removed = 0
+        self.last_run: Optional[Dict] = None
+
+    def _delete_expired_rows(self, db: Session, model, key, expires_at) -> int:
+        removed = 0
+        now = datetime.utcnow()
+        while True:
+            keys = [row[0] for row in (
+                db.query(key)
+                .filter(expires_at < now)
+                .order_by(expires_at)
+                .limit(self.batch_size)
+                .all()
+            )]
+            if not keys:
+                break
+            removed += db.query(model).filter(key.in_(keys)).delete(synchronize_session=False)
+            db.commit()
+            if len(keys) < self.batch_size:
+                break
+        return removed
+
+    def delete_expired(self, db: Session) -> int:
+        """Delete expired sessions in batches. Returns the number of rows removed."""
+        return self._delete_expired_rows(db, SessionModel, SessionModel.id, SessionModel.expires_at)
+
+    def delete_expired_revocations(self, db: Session) -> int:
+        """Delete revocations of tokens that have expired anyway. Returns the number of rows removed."""
+        return self._delete_expired_rows(db, RevokedToken, RevokedToken.jti, RevokedToken.expires_at)
+
+    def cap_sessions(self, db: Session) -> int:
+        """Delete each user's oldest sessions beyond max_per_user. Returns the number of rows removed."""
+        if self.max_per_user <= 0:
+            return 0
+
+        removed = 0
+        over_limit = (
+            db.query(SessionModel.user_id)
+            .group_by(SessionModel.user_id)
+            .having(func.count(SessionModel.id) > self.max_per_user)
+            .limit(self.batch_size)
+            .all()
+        )
+        for (user_id,) in over_limit:
+            ids = [row.id for row in (
+                db.query(SessionModel.id)
+                .filter(SessionModel.user_id == user_id)
+                .order_by(SessionModel.created_at.desc())
+                .offset(self.max_per_user)
+                .all()
+            )]
+            if ids:
+                removed += db.query(SessionModel).filter(SessionModel.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+                session_cache.invalidate_user(user_id)
+        return removed
+
+    def run_once(self) -> Dict:
+        """Run one sweep with its own database session."""
+        started = time.monotonic()
+        db = SessionLocal()
+        try:
+            expired = self.delete_expired(db)
+            capped = self.cap_sessions(db)
+            revocations = self.delete_expired_revocations(db)
+        finally:
+            db.close()
+
+        self.runs += 1
+        self.expired_removed += expired
+        self.capped_removed += capped
+        self.revocations_removed += revocations
+        self.last_run = {
+            "finished_at": datetime.utcnow(),
+            "expired_removed": expired,
+            "capped_removed": capped,
+            "revocations_removed": revocations,
+            "duration_seconds": round(time.monotonic() - started, 3),
+        }
+        if expired or capped:
+            logger.info(f"Session sweep removed {expired} expired and {capped} over-limit sessions.")
+        return self.last_run
+
+    def start(self) -> None:
+        """Start sweeping in the background on the current event loop."""
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop_event.set()
+        await self._task
+        self._task = None
+
+    async def _sweep_loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                # Blocking database I/O; keep it off the API event loop
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Session sweep failed: {e}")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval_seconds,
+            "max_sessions_per_user": self.max_per_user,
+            "runs": self.runs,
+            "expired_removed": self.expired_removed,
+            "capped_removed": self.capped_removed,
+            "revocations_removed": self.revocations_removed,
+            "last_run": self.last_run,
+        }
+
+
+# Singleton instance of the sweeper
+session_sweeper = SessionSweeper()
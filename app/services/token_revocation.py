@@ -0,0 +1,116 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_logger, SessionLocal, REVOCATION_REFRESH_SECONDS
+from app.models import RevokedToken
+
+logger = get_logger(__name__)
+
+# Each incremental refresh re-reads this much of the previous window, so rows
+# another worker committed slightly out of timestamp order are not missed
+_REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+class RevocationList:
+    """
+    In-memory set of revoked access-token ids (jti) for stateless auth.
+
+    Only revocations of unexpired tokens are kept, and access tokens are
+    short-lived, so the set stays small. Each worker pulls revocations made
+    by other workers every REVOCATION_REFRESH_SECONDS, reading only rows
+    revoked since its last refresh; a revocation made on this worker applies
+    immediately.
+    """
+
+    def __init__(self, refresh_seconds: int = REVOCATION_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._revoked: Dict[str, datetime] = {}  # jti -> token expiry
+        self._loaded_until: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self.refreshes = 0
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Tokens without a jti cannot be revoked, so they count as revoked."""
+        return jti is None or jti in self._revoked
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime) -> None:
+        """Revoke a token until it expires."""
+        with self._lock:
+            self._revoked[jti] = expires_at
+        db.merge(RevokedToken(jti=jti, expires_at=expires_at, revoked_at=datetime.utcnow()))
+        db.commit()
+
+    def refresh(self, db: Session) -> int:
+        """
+        Load revocations made since the last refresh and forget expired ones.
+
+        Returns:
+            Number of revocation rows read
+        """
+        now = datetime.utcnow()
+        query = db.query(RevokedToken.jti, RevokedToken.expires_at).filter(RevokedToken.expires_at > now)
+        if self._loaded_until is not None:
+            query = query.filter(RevokedToken.revoked_at >= self._loaded_until - _REFRESH_OVERLAP)
+        rows = query.all()
+
+        with self._lock:
+            for jti, expires_at in rows:
+                self._revoked[jti] = expires_at
+            for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+                del self._revoked[jti]
+            self._loaded_until = now
+        self.refreshes += 1
+        return len(rows)
+
+    def run_once(self) -> None:
+        db = SessionLocal()
+        try:
+            self.refresh(db)
+        finally:
+            db.close()
+
+    async def start(self) -> None:
+        """Load current revocations, then keep refreshing in the background."""
+        try:
+            await asyncio.to_thread(self.run_once)
+        except Exception as e:
+            logger.error(f"Initial revocation list load failed: {e}")
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop_event.set()
+        await self._task
+        self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.refresh_seconds)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                break
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Revocation list refresh failed: {e}")
+
+    def stats(self) -> Dict:
+        return {
+            "revoked_tokens": len(self._revoked),
+            "refreshes": self.refreshes,
+            "loaded_until": self._loaded_until,
+        }
+
+
+# Singleton revocation list shared by the auth dependencies
+revocation_list = RevocationList()
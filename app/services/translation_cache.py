@@ -0,0 +1,261 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    get_logger, TRANSLATION_GLOSSARY_VERSION, TRANSLATION_CACHE_TTL_DAYS, TRANSLATION_CACHE_MAX_ENTRIES
+)
+from app.models import TranslationCacheEntry
+
+logger = get_logger(__name__)
+
+# Run TTL/size eviction after this many writes
+EVICTION_INTERVAL = 100
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of the exact source text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _provider_list(providers: Union[str, Sequence[str]]) -> List[str]:
+    return [providers] if isinstance(providers, str) else list(providers)
+
+
+class TranslationCache:
+    """
+    Database-backed translation cache.
+
+    Entries are keyed by (content hash, target language, provider, glossary
+    version) and remember the source file they came from so a chapter's
+    translations can be invalidated together. Whole documents and individual
+    Markdown segments share the table; they differ only in what was hashed.
+    Lookups accept several providers in order of preference, since any
+    configured provider's translation may be served.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.segment_hits = 0
+        self.segment_misses = 0
+        self._writes_since_eviction = 0
+
+    def _ttl_cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(days=TRANSLATION_CACHE_TTL_DAYS)
+
+    def get(self, db: Session, digest: str, target_language: str,
+            providers: Union[str, Sequence[str]]) -> Optional[str]:
+        """
+        Look up a cached translation.
+
+        Args:
+            db: Database session
+            digest: content_hash() of the source text
+            target_language: Target language code
+            providers: Provider(s) whose translations may be served, preferred first
+
+        Returns:
+            Translated text, or None on a miss or expired entry
+        """
+        providers = _provider_list(providers)
+        entries = db.query(TranslationCacheEntry).filter(
+            TranslationCacheEntry.content_hash == digest,
+            TranslationCacheEntry.target_language == target_language,
+            TranslationCacheEntry.provider.in_(providers),
+            TranslationCacheEntry.glossary_version == TRANSLATION_GLOSSARY_VERSION,
+            TranslationCacheEntry.created_at >= self._ttl_cutoff()
+        ).all()
+        entry = min(entries, key=lambda e: providers.index(e.provider), default=None)
+
+        if not entry:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entry.hit_count += 1
+        entry.last_accessed_at = datetime.utcnow()
+        db.commit()
+        return entry.translated_text
+
+    def contains(self, db: Session, digest: str, target_language: str,
+                 providers: Union[str, Sequence[str]]) -> bool:
+        """Whether a live entry exists, without counting a lookup or touching its LRU position."""
+        return db.query(TranslationCacheEntry.id).filter(
+            TranslationCacheEntry.content_hash == digest,
+            TranslationCacheEntry.target_language == target_language,
+            TranslationCacheEntry.provider.in_(_provider_list(providers)),
+            TranslationCacheEntry.glossary_version == TRANSLATION_GLOSSARY_VERSION,
+            TranslationCacheEntry.created_at >= self._ttl_cutoff()
+        ).first() is not None
+
+    def put(self, db: Session, digest: str, target_language: str, provider: str,
+            translated_text: str, source_file: Optional[str] = None) -> None:
+        """Store (or refresh) a translation."""
+        now = datetime.utcnow()
+        entry = db.query(TranslationCacheEntry).filter(
+            TranslationCacheEntry.content_hash == digest,
+            TranslationCacheEntry.target_language == target_language,
+            TranslationCacheEntry.provider == provider,
+            TranslationCacheEntry.glossary_version == TRANSLATION_GLOSSARY_VERSION
+        ).first()
+
+        if entry:
+            entry.translated_text = translated_text
+            entry.char_count = len(translated_text)
+            entry.source_file = source_file or entry.source_file
+            entry.created_at = now
+            entry.last_accessed_at = now
+        else:
+            db.add(TranslationCacheEntry(
+                content_hash=digest,
+                target_language=target_language,
+                provider=provider,
+                glossary_version=TRANSLATION_GLOSSARY_VERSION,
+                source_file=source_file,
+                translated_text=translated_text,
+                char_count=len(translated_text),
+                created_at=now,
+                last_accessed_at=now
+            ))
+
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request stored the same key first; its entry is just as good
+            db.rollback()
+
+        self._writes_since_eviction += 1
+        if self._writes_since_eviction >= EVICTION_INTERVAL:
+            self._writes_since_eviction = 0
+            self.evict(db)
+
+    def get_many(self, db: Session, digests: Iterable[str], target_language: str,
+                 providers: Union[str, Sequence[str]]) -> Dict[str, str]:
+        """
+        Look up many segment translations in one query.
+
+        Returns:
+            Map of content hash -> translated text for the entries found
+        """
+        digests = list(dict.fromkeys(digests))
+        if not digests:
+            return {}
+
+        providers = _provider_list(providers)
+        entries = db.query(TranslationCacheEntry).filter(
+            TranslationCacheEntry.content_hash.in_(digests),
+            TranslationCacheEntry.target_language == target_language,
+            TranslationCacheEntry.provider.in_(providers),
+            TranslationCacheEntry.glossary_version == TRANSLATION_GLOSSARY_VERSION,
+            TranslationCacheEntry.created_at >= self._ttl_cutoff()
+        ).all()
+
+        # Keep the preferred provider's entry when several providers cached a segment
+        found: Dict[str, TranslationCacheEntry] = {}
+        for entry in sorted(entries, key=lambda e: providers.index(e.provider), reverse=True):
+            found[entry.content_hash] = entry
+
+        now = datetime.utcnow()
+        for entry in found.values():
+            entry.hit_count += 1
+            entry.last_accessed_at = now
+        if found:
+            db.commit()
+
+        self.segment_hits += len(found)
+        self.segment_misses += len(digests) - len(found)
+        return {digest: entry.translated_text for digest, entry in found.items()}
+
+    def put_many(self, db: Session, translations: Dict[str, str], target_language: str,
+                 provider: str, source_file: Optional[str] = None) -> None:
+        """Store many segment translations (content hash -> translated text) in one commit."""
+        if not translations:
+            return
+
+        existing = {
+            row.content_hash for row in db.query(TranslationCacheEntry.content_hash).filter(
+                TranslationCacheEntry.content_hash.in_(list(translations)),
+                TranslationCacheEntry.target_language == target_language,
+                TranslationCacheEntry.provider == provider,
+                TranslationCacheEntry.glossary_version == TRANSLATION_GLOSSARY_VERSION
+            )
+        }
+        now = datetime.utcnow()
+        for digest, translated_text in translations.items():
+            if digest in existing:
+                continue
+            db.add(TranslationCacheEntry(
+                content_hash=digest,
+                target_language=target_language,
+                provider=provider,
+                glossary_version=TRANSLATION_GLOSSARY_VERSION,
+                source_file=source_file,
+                translated_text=translated_text,
+                char_count=len(translated_text),
+                created_at=now,
+                last_accessed_at=now
+            ))
+
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+
+    def invalidate_source_file(self, db: Session, source_file: str) -> int:
+        """Delete every cached translation of a source file. Returns the number of entries removed."""
+        removed = db.query(TranslationCacheEntry).filter(
+            TranslationCacheEntry.source_file == source_file
+        ).delete(synchronize_session=False)
+        db.commit()
+        logger.info(f"Invalidated {removed} cached translations for {source_file}.")
+        return removed
+
+    def evict(self, db: Session) -> int:
+        """Drop expired entries, then least recently used ones beyond the size limit."""
+        removed = db.query(TranslationCacheEntry).filter(
+            TranslationCacheEntry.created_at < self._ttl_cutoff()
+        ).delete(synchronize_session=False)
+
+        excess = db.query(func.count(TranslationCacheEntry.id)).scalar() - TRANSLATION_CACHE_MAX_ENTRIES
+        if excess > 0:
+            oldest = [row.id for row in db.query(TranslationCacheEntry.id).order_by(
+                TranslationCacheEntry.last_accessed_at.asc()
+            ).limit(excess)]
+            removed += db.query(TranslationCacheEntry).filter(
+                TranslationCacheEntry.id.in_(oldest)
+            ).delete(synchronize_session=False)
+
+        db.commit()
+        if removed:
+            logger.info(f"Evicted {removed} translation cache entries.")
+        return removed
+
+    def stats(self, db: Session) -> Dict:
+        """Entry count, stored characters and hit rate since startup."""
+        entries, chars = db.query(
+            func.count(TranslationCacheEntry.id),
+            func.coalesce(func.sum(TranslationCacheEntry.char_count), 0)
+        ).one()
+        lookups = self.hits + self.misses
+        segment_lookups = self.segment_hits + self.segment_misses
+        return {
+            "entries": entries,
+            "stored_characters": int(chars),
+            "max_entries": TRANSLATION_CACHE_MAX_ENTRIES,
+            "ttl_days": TRANSLATION_CACHE_TTL_DAYS,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "segment_hits": self.segment_hits,
+            "segment_misses": self.segment_misses,
+            "segment_hit_rate": round(self.segment_hits / segment_lookups, 4) if segment_lookups else 0.0,
+        }
+
+
+# Singleton instance of the cache
+translation_cache = TranslationCache()
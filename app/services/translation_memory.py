@@ -0,0 +1,275 @@
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    get_logger, TRANSLATION_GLOSSARY_VERSION, TRANSLATION_MEMORY_ENABLED,
+    TRANSLATION_MEMORY_THRESHOLD, TRANSLATION_MEMORY_MIN_CHARS, TRANSLATION_MEMORY_MAX_ENTRIES
+)
+from app.models import TranslationMemoryEntry
+from app.services.minhash import MinHasher, LSHIndex, char_shingles, estimate_jaccard
+from app.services.translation_cache import content_hash
+
+logger = get_logger(__name__)
+
+_NUM_PERM = 128
+_BANDS = 16
+_SHINGLE_SIZE = 5
+
+# Pick up entries written by other workers at most this often
+REFRESH_INTERVAL_SECONDS = 60
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_PUNCTUATION_RE = re.compile(r"[^\w\s#]")
+
+
+def _template(text: str) -> str:
+    """Text with numbers masked and whitespace collapsed."""
+    return " ".join(_NUMBER_RE.sub("#", text).split())
+
+
+def _words(text: str) -> str:
+    """Template with punctuation dropped as well, so only the words remain."""
+    return " ".join(_PUNCTUATION_RE.sub(" ", _template(text)).split())
+
+
+def adapt_numbers(source: str, match_source: str, match_translation: str) -> Optional[str]:
+    """
+    Rewrite a stored translation for a source that differs only in its numbers.
+
+    Each number of the stored source must appear exactly once in its
+    translation, so the substitution is unambiguous.
+
+    Returns:
+        Adapted translation, or None if the texts differ in more than numbers
+    """
+    if _template(source) != _template(match_source):
+        return None
+
+    new_numbers = _NUMBER_RE.findall(source)
+    old_numbers = _NUMBER_RE.findall(match_source)
+    if new_numbers == old_numbers:
+        return match_translation
+
+    replacements = {}
+    for old, new in zip(old_numbers, new_numbers):
+        if old != new:
+            if replacements.get(old, new) != new:
+                return None
+            replacements[old] = new
+    for old in replacements:
+        if len(re.findall(rf"(?<![\d.]){re.escape(old)}(?![\d]|\.\d)", match_translation)) != 1:
+            return None
+
+    return re.sub(
+        r"(?<![\d.])\d+(?:\.\d+)?(?![\d]|\.\d)",
+        lambda m: replacements.get(m.group(0), m.group(0)),
+        match_translation
+    )
+
+
+@dataclass
+class _MemoryIndex:
+    """In-memory LSH over one (language, provider, glossary version) slice of the memory."""
+    lsh: LSHIndex = field(default_factory=lambda: LSHIndex(num_perm=_NUM_PERM, bands=_BANDS))
+    signatures: List[np.ndarray] = field(default_factory=list)
+    entries: List[Tuple[str, str, str]] = field(default_factory=list)  # (source_hash, source_text, translated_text)
+    hashes: set = field(default_factory=set)
+    loaded_until: Optional[datetime] = None
+    refreshed_at: float = 0.0
+
+    def add(self, source_hash: str, source_text: str, translated_text: str, signature: np.ndarray) -> None:
+        if source_hash in self.hashes:
+            return
+        self.hashes.add(source_hash)
+        self.lsh.insert(len(self.entries), signature)
+        self.signatures.append(signature)
+        self.entries.append((source_hash, source_text, translated_text))
+
+
+class TranslationMemory:
+    """
+    Fuzzy translation memory over previously translated segments.
+
+    Segments are indexed by MinHash signatures of their character 5-grams.
+    A new segment reuses a stored translation when the stored source differs
+    only in its numbers (the numbers are substituted into the translation),
+    or when it is at least TRANSLATION_MEMORY_THRESHOLD similar, has the same
+    numbers and differs only in whitespace or punctuation. A match that
+    differs in any word goes to the provider, however similar: "is" and
+    "is not" score above 0.9 but mean the opposite.
+    """
+
+    def __init__(self):
+        self.hasher = MinHasher(num_perm=_NUM_PERM)
+        self._indexes: Dict[Tuple[str, str, str], _MemoryIndex] = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.fuzzy_hits = 0
+        self.adapted_hits = 0
+        self.characters_saved = 0
+
+    def _signature(self, text: str) -> np.ndarray:
+        return self.hasher.signature(char_shingles(text, k=_SHINGLE_SIZE))
+
+    def _index(self, db: Session, target_language: str, provider: str) -> _MemoryIndex:
+        key = (target_language, provider, TRANSLATION_GLOSSARY_VERSION)
+        with self._lock:
+            index = self._indexes.setdefault(key, _MemoryIndex())
+            if time.monotonic() - index.refreshed_at < REFRESH_INTERVAL_SECONDS:
+                return index
+
+            query = db.query(TranslationMemoryEntry).filter(
+                TranslationMemoryEntry.target_language == target_language,
+                TranslationMemoryEntry.provider == provider,
+                TranslationMemoryEntry.glossary_version == TRANSLATION_GLOSSARY_VERSION
+            )
+            if index.loaded_until is not None:
+                query = query.filter(TranslationMemoryEntry.created_at >= index.loaded_until)
+            rows = query.order_by(TranslationMemoryEntry.created_at.desc()).limit(TRANSLATION_MEMORY_MAX_ENTRIES).all()
+
+            for row in reversed(rows):
+                signature = np.frombuffer(row.signature, dtype=np.uint32).astype(np.uint64)
+                index.add(row.source_hash, row.source_text, row.translated_text, signature)
+            if rows:
+                index.loaded_until = rows[0].created_at
+            index.refreshed_at = time.monotonic()
+            return index
+
+    def lookup(self, db: Session, texts: List[str], target_language: str,
+               providers: Union[str, Sequence[str]]) -> Dict[str, Tuple[str, str]]:
+        """
+        Find reusable translations for segments that missed the exact cache.
+
+        Each reused entry's reuse_count is incremented.
+
+        Args:
+            providers: Provider(s) whose translations may be reused
+
+        Returns:
+            Map of source text -> (reused, possibly number-adapted, translation,
+            provider that produced the stored translation)
+        """
+        if not TRANSLATION_MEMORY_ENABLED or not texts:
+            return {}
+
+        providers = [providers] if isinstance(providers, str) else list(providers)
+        indexes = [self._index(db, target_language, provider) for provider in providers]
+        reused = {}
+        reuses: Counter = Counter()  # (provider, source_hash) -> times reused
+        for text in texts:
+            self.lookups += 1
+            signature = self._signature(text)
+            best, best_provider, best_score = None, None, 0.0
+            for provider, index in zip(providers, indexes):
+                for candidate in index.lsh.query(signature):
+                    score = estimate_jaccard(signature, index.signatures[candidate])
+                    if score > best_score:
+                        match_hash, match_source, match_translation = index.entries[candidate]
+                        translation = self._reuse(text, match_source, match_translation, score)
+                        if translation is not None:
+                            best = (match_hash, translation, translation != match_translation)
+                            best_provider, best_score = provider, score
+            if best is None:
+                continue
+
+            match_hash, translation, adapted = best
+            if adapted:
+                self.adapted_hits += 1
+            else:
+                self.fuzzy_hits += 1
+            reused[text] = (translation, best_provider)
+            reuses[(best_provider, match_hash)] += 1
+            self.characters_saved += len(text)
+
+        if reused:
+            logger.info(f"Translation memory reused {len(reused)} of {len(texts)} segments.")
+            self._count_reuses(db, reuses, target_language)
+        return reused
+
+    def _reuse(self, text: str, match_source: str, match_translation: str, score: float) -> Optional[str]:
+        """Translation of text derived from one stored entry, or None if the entry does not qualify."""
+        translation = adapt_numbers(text, match_source, match_translation)
+        if translation is not None:
+            return translation
+        if (len(text) >= TRANSLATION_MEMORY_MIN_CHARS and score >= TRANSLATION_MEMORY_THRESHOLD
+                and _NUMBER_RE.findall(text) == _NUMBER_RE.findall(match_source)
+                and _words(text) == _words(match_source)):
+            return match_translation
+        return None
+
+    def _count_reuses(self, db: Session, reuses: Counter, target_language: str) -> None:
+        """Increment reuse_count of the reused entries, one UPDATE per (provider, increment)."""
+        groups: Dict[Tuple[str, int], List[str]] = {}
+        for (provider, source_hash), count in reuses.items():
+            groups.setdefault((provider, count), []).append(source_hash)
+        try:
+            for (provider, count), source_hashes in groups.items():
+                db.query(TranslationMemoryEntry).filter(
+                    TranslationMemoryEntry.source_hash.in_(source_hashes),
+                    TranslationMemoryEntry.target_language == target_language,
+                    TranslationMemoryEntry.provider == provider,
+                    TranslationMemoryEntry.glossary_version == TRANSLATION_GLOSSARY_VERSION
+                ).update({TranslationMemoryEntry.reuse_count: TranslationMemoryEntry.reuse_count + count},
+                         synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            # Usage statistics only; never fail a translation over them
+            db.rollback()
+            logger.warning(f"Could not update translation memory reuse counts: {e}")
+
+    def add(self, db: Session, translations: Dict[str, str], target_language: str, provider: str) -> None:
+        """Remember provider translations (source text -> translated text)."""
+        if not TRANSLATION_MEMORY_ENABLED or not translations:
+            return
+
+        index = self._index(db, target_language, provider)
+        now = datetime.utcnow()
+        for source_text, translated_text in translations.items():
+            source_hash = content_hash(source_text)
+            if source_hash in index.hashes:
+                continue
+            signature = self._signature(source_text)
+            db.add(TranslationMemoryEntry(
+                source_hash=source_hash,
+                source_text=source_text,
+                target_language=target_language,
+                provider=provider,
+                glossary_version=TRANSLATION_GLOSSARY_VERSION,
+                translated_text=translated_text,
+                signature=signature.astype(np.uint32).tobytes(),
+                created_at=now
+            ))
+            with self._lock:
+                index.add(source_hash, source_text, translated_text, signature)
+
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker stored some of these first
+            db.rollback()
+
+    def stats(self) -> Dict:
+        hits = self.fuzzy_hits + self.adapted_hits
+        return {
+            "enabled": TRANSLATION_MEMORY_ENABLED,
+            "threshold": TRANSLATION_MEMORY_THRESHOLD,
+            "indexed_segments": sum(len(index.entries) for index in self._indexes.values()),
+            "lookups": self.lookups,
+            "hits": hits,
+            "adapted_hits": self.adapted_hits,
+            "hit_rate": round(hits / self.lookups, 4) if self.lookups else 0.0,
+            "provider_characters_saved": self.characters_saved,
+        }
+
+
+# Singleton instance of the translation memory
+translation_memory = TranslationMemory()
@@ -1,8 +1,40 @@
+import asyncio
 import os
 import re
+import time
 from google.cloud import translate_v2 as translate
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from openai import OpenAI
+from sqlalchemy.orm import Session
+
+from app.core.config import get_logger, TRANSLATION_GOOGLE_BATCH_CHARS, TRANSLATION_OPENAI_BATCH_CHARS
+from app.services.translation_cache import translation_cache, content_hash
+from app.services.translation_memory import translation_memory
+from app.services.markdown_segments import split_markdown, translatable_texts, reassemble
+from app.services.provider_gate import provider_gates
+from app.services.provider_router import provider_router
+from app.services.markdown_protect import (
+    ProtectedText, protect, restore, PLACEHOLDER_OPEN, PLACEHOLDER_CLOSE
+)
+
+logger = get_logger(__name__)
+
+language_names = {
+    'ur': 'Urdu',
+    'ar': 'Arabic',
+    'hi': 'Hindi',
+    'es': 'Spanish',
+    'fr': 'French'
+}
+
+# Google Translate v2 accepts at most 128 text segments per request
+GOOGLE_MAX_SEGMENTS = 128
+
+# Streaming keeps Google batches small so the first segments arrive quickly
+STREAM_GOOGLE_BATCH_SEGMENTS = 16
+
+# Marks each segment inside a batched OpenAI request, e.g. "[[3]]"
+_SEGMENT_MARKER_RE = re.compile(r"^\s*\[\[(\d+)\]\]\s*$", re.MULTILINE)
 
 # Ensure GOOGLE_APPLICATION_CREDENTIALS environment variable is set
 # to the path of your service account key file.
@@ -31,80 +63,452 @@ class TranslationService:
         if not self.google_client and not self.openai_client:
             print("TranslationService initialized in mock mode (no credentials available).")
 
-    def _extract_code_blocks(self, text: str) -> list[tuple[str, str]]:
-        """Extract code blocks from markdown text."""
-        pattern = r'(```[\w]*\n.*?\n```)'
-        code_blocks = re.findall(pattern, text, re.DOTALL)
-        return [(f"__CODE_BLOCK_{i}__", block) for i, block in enumerate(code_blocks)]
-
-    def _remove_code_blocks(self, text: str, code_blocks: list[tuple[str, str]]) -> str:
-        """Replace code blocks with placeholders."""
-        result = text
-        for placeholder, block in code_blocks:
-            result = result.replace(block, placeholder)
-        return result
-
-    def _restore_code_blocks(self, text: str, code_blocks: list[tuple[str, str]]) -> str:
-        """Restore code blocks from placeholders."""
-        result = text
-        for placeholder, block in code_blocks:
-            result = result.replace(placeholder, block)
-        return result
+    @property
+    def available_providers(self) -> List[str]:
+        """Configured providers, healthiest first according to the router."""
+        configured = [name for name, client in (("google", self.google_client), ("openai", self.openai_client)) if client]
+        return provider_router.order(configured)
+
+    @property
+    def active_provider(self) -> str:
+        """Provider the router currently prefers: 'google', 'openai' or 'mock'."""
+        providers = self.available_providers
+        return providers[0] if providers else "mock"
+
+    def _provider_calls(self, texts: List[str], target_language: str) -> Dict[str, Callable[[], Awaitable[List[str]]]]:
+        """Per-provider coroutine factories translating one batch, for the router."""
+        calls = {}
+        if self.google_client:
+            calls["google"] = lambda: self._google_batch(texts, target_language)
+        if self.openai_client:
+            calls["openai"] = lambda: self._openai_batch(texts, target_language)
+        return calls
+
+    async def translate_document(self, db: Session, text: str, target_language: str = "ur",
+                                 source_file: Optional[str] = None) -> Tuple[Optional[str], bool]:
+        """
+        Translate a Markdown document, reusing cached translations.
+
+        Whole-document repeats are served from cache directly. Otherwise the
+        document is split into segments and only segments without a cached
+        translation are sent to the provider, so re-translating an edited
+        chapter costs roughly the size of the edit.
+
+        Returns:
+            Tuple of (translated text or None on failure, whether it came entirely from cache)
+        """
+        providers = self.available_providers
+        if not providers:
+            return await self.translate_text(text, target_language), False
+
+        digest = content_hash(text)
+        cached = translation_cache.get(db, digest, target_language, providers)
+        if cached is not None:
+            return cached, True
+
+        segments = split_markdown(text)
+        texts = translatable_texts(segments)
+        hashes = {segment_text: content_hash(segment_text) for segment_text in texts}
+        cached_segments = translation_cache.get_many(db, hashes.values(), target_language, providers)
+
+        translations = {
+            segment_text: cached_segments[hashes[segment_text]]
+            for segment_text in texts if hashes[segment_text] in cached_segments
+        }
+        missing = [segment_text for segment_text in texts if segment_text not in translations]
+        missing = self._reuse_from_memory(db, missing, translations, hashes, target_language, providers, source_file)
+        logger.info(f"Translating {len(missing)} of {len(texts)} segments ({len(texts) - len(missing)} cached or reused).")
+
+        if missing:
+            translated_segments = await self.translate_segments(missing, target_language)
+            by_provider: Dict[str, Dict[str, str]] = {}
+            for segment_text, result in zip(missing, translated_segments):
+                if result is None:
+                    continue
+                translated_segment, provider = result
+                by_provider.setdefault(provider, {})[segment_text] = translated_segment
+                translations[segment_text] = translated_segment
+            # Keep the batches that succeeded, so a retry only pays for the rest
+            self._store_segments(db, by_provider, hashes, target_language, source_file)
+            if any(result is None for result in translated_segments):
+                return None, False
+
+        translated_text = reassemble(segments, translations)
+        translation_cache.put(db, digest, target_language, self.active_provider, translated_text, source_file)
+        return translated_text, not missing
+
+    def _store_segments(self, db: Session, by_provider: Dict[str, Dict[str, str]], hashes: Dict[str, str],
+                        target_language: str, source_file: Optional[str]) -> None:
+        """Cache and remember new segment translations under the provider that produced them."""
+        for provider, segment_translations in by_provider.items():
+            translation_cache.put_many(
+                db, {hashes[segment_text]: translated for segment_text, translated in segment_translations.items()},
+                target_language, provider, source_file
+            )
+            translation_memory.add(db, segment_translations, target_language, provider)
+
+    def _reuse_from_memory(self, db: Session, missing: List[str], translations: Dict[str, str],
+                           hashes: Dict[str, str], target_language: str, providers: List[str],
+                           source_file: Optional[str]) -> List[str]:
+        """
+        Fill translations from the fuzzy translation memory.
+
+        Reused translations are also written to the exact cache, under the
+        provider that produced the stored translation, so the next request
+        for the same segment is a plain cache hit.
+
+        Returns:
+            The segments that still need the provider
+        """
+        reused = translation_memory.lookup(db, missing, target_language, providers)
+        if not reused:
+            return missing
+        by_provider: Dict[str, Dict[str, str]] = {}
+        for segment_text, (translated, provider) in reused.items():
+            translations[segment_text] = translated
+            by_provider.setdefault(provider, {})[hashes[segment_text]] = translated
+        for provider, segment_translations in by_provider.items():
+            translation_cache.put_many(db, segment_translations, target_language, provider, source_file)
+        return [segment_text for segment_text in missing if segment_text not in reused]
+
+    async def translate_document_stream(self, db: Session, text: str, target_language: str = "ur",
+                                        source_file: Optional[str] = None) -> AsyncIterator[Dict]:
+        """
+        Translate a Markdown document, yielding segments as they become ready.
+
+        Structural and cached segments are yielded immediately; the rest follow
+        in completion order. With OpenAI, partial translations are yielded as
+        "delta" events while tokens arrive (when the router prefers OpenAI).
+        Every event carries the segment's
+        index, so the client can render "".join(texts by index) at any point.
+
+        Events:
+            {"type": "start", "segments": n, "cached": n, "pending": n}
+            {"type": "segment", "index": i, "text": str, "translatable": bool, "cached": bool}
+            {"type": "delta", "index": i, "text": str}
+            {"type": "error", "index": i, "detail": str}
+            {"type": "done", "cached": bool, "failed": n}
+        """
+        providers = self.available_providers
+        segments = split_markdown(text)
+        positions: Dict[str, List[int]] = {}
+        for index, segment in enumerate(segments):
+            if segment.translatable:
+                positions.setdefault(segment.text, []).append(index)
+
+        hashes = {segment_text: content_hash(segment_text) for segment_text in positions}
+        cached_segments = {}
+        if providers:
+            cached_segments = translation_cache.get_many(db, hashes.values(), target_language, providers)
+        translations = {
+            segment_text: cached_segments[digest]
+            for segment_text, digest in hashes.items() if digest in cached_segments
+        }
+        missing = [segment_text for segment_text in positions if segment_text not in translations]
+        if providers:
+            missing = self._reuse_from_memory(db, missing, translations, hashes, target_language, providers, source_file)
+
+        yield {"type": "start", "segments": len(segments), "cached": len(positions) - len(missing), "pending": len(missing)}
+        for index, segment in enumerate(segments):
+            if not segment.translatable:
+                yield {"type": "segment", "index": index, "text": segment.text, "translatable": False, "cached": True}
+            elif segment.text in translations:
+                yield {"type": "segment", "index": index, "text": translations[segment.text], "translatable": True, "cached": True}
+
+        events: asyncio.Queue = asyncio.Queue()
+        if not providers:
+            tasks = []
+            for segment_text in missing:
+                events.put_nowait(("done", segment_text, f"[MOCK TRANSLATION] {segment_text} (to {target_language})", "mock"))
+        elif providers[0] == "openai":
+            tasks = [asyncio.create_task(self._stream_openai_segment(segment_text, target_language, events))
+                     for segment_text in missing]
+        else:
+            batches = self._make_batches(missing, TRANSLATION_GOOGLE_BATCH_CHARS, STREAM_GOOGLE_BATCH_SEGMENTS)
+            tasks = [asyncio.create_task(self._stream_batch(batch, target_language, events)) for batch in batches]
+
+        by_provider: Dict[str, Dict[str, str]] = {}
+        failed = 0
+        try:
+            for _ in range(len(missing)):
+                kind, segment_text, payload, provider = await events.get()
+                while kind == "delta":
+                    for index in positions[segment_text]:
+                        yield {"type": "delta", "index": index, "text": payload}
+                    kind, segment_text, payload, provider = await events.get()
+
+                if kind == "error":
+                    failed += 1
+                    for index in positions[segment_text]:
+                        yield {"type": "error", "index": index, "detail": payload}
+                    continue
+
+                translated_segment = payload.strip()
+                translations[segment_text] = translated_segment
+                by_provider.setdefault(provider, {})[segment_text] = translated_segment
+                for index in positions[segment_text]:
+                    yield {"type": "segment", "index": index, "text": translated_segment, "translatable": True, "cached": False}
+        finally:
+            # Also runs when the client disconnects: keep what was already paid for
+            for task in tasks:
+                task.cancel()
+            if providers:
+                self._store_segments(db, by_provider, hashes, target_language, source_file)
+                if not failed and len(translations) == len(positions):
+                    translation_cache.put(db, content_hash(text), target_language, self.active_provider,
+                                          reassemble(segments, translations), source_file)
+
+        yield {"type": "done", "cached": not missing, "failed": failed}
+
+    async def _stream_batch(self, texts: List[str], target_language: str, events: asyncio.Queue,
+                            exclude: Optional[str] = None) -> None:
+        calls = self._provider_calls(texts, target_language)
+        calls.pop(exclude, None)
+        try:
+            if not calls:
+                raise RuntimeError("No other translation provider available")
+            results, provider = await provider_router.call(calls, characters=sum(len(text) for text in texts))
+        except Exception as e:
+            logger.error(f"Error during streamed translation: {e}")
+            for segment_text in texts:
+                events.put_nowait(("error", segment_text, "Translation failed", None))
+            return
+        for segment_text, translated_segment in zip(texts, results):
+            events.put_nowait(("done", segment_text, translated_segment, provider))
+
+    async def _stream_openai_segment(self, text: str, target_language: str, events: asyncio.Queue) -> None:
+        """Stream one segment's completion, forwarding token deltas from the worker thread."""
+        protected = protect(text)
+        if not protected.needs_translation:
+            events.put_nowait(("done", text, text, "openai"))
+            return
+
+        loop = asyncio.get_running_loop()
+
+        def consume() -> str:
+            stream = self.openai_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": self._openai_instructions(target_language)},
+                    {"role": "user", "content": protected.text}
+                ],
+                temperature=0.3,
+                stream=True
+            )
+            parts = []
+            buffered = ""
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                parts.append(delta)
+                buffered += delta
+                # Hold back a placeholder that has only partly arrived
+                cut = buffered.rfind(PLACEHOLDER_OPEN)
+                if cut == -1 or PLACEHOLDER_CLOSE in buffered[cut:]:
+                    cut = len(buffered)
+                ready, buffered = buffered[:cut], buffered[cut:]
+                if ready:
+                    ready, _ = restore(ready, protected, repair=False)
+                    loop.call_soon_threadsafe(events.put_nowait, ("delta", text, ready, "openai"))
+            return "".join(parts)
+
+        started = time.monotonic()
+        try:
+            translated_segment = await provider_gates["openai"].run(consume)
+        except Exception as e:
+            provider_router.record("openai", time.monotonic() - started, len(text), ok=False)
+            logger.warning(f"Streamed OpenAI translation failed ({e}); falling back to the other provider.")
+            await self._stream_batch([text], target_language, events, exclude="openai")
+            return
+        provider_router.record("openai", time.monotonic() - started, len(text), ok=True)
+        events.put_nowait(("done", text, self._restore(translated_segment, protected), "openai"))
+
+    async def translate_segments(self, texts: List[str],
+                                 target_language: str = "ur") -> List[Optional[Tuple[str, str]]]:
+        """
+        Translate many segments with batched, parallel provider calls.
+
+        Segments are packed into provider-sized batches. Google receives each
+        batch as a list in one `translate` call; OpenAI splits it into
+        completions of at most TRANSLATION_OPENAI_BATCH_CHARS. Each batch is
+        routed to the healthier provider (with failover and optional hedging)
+        and batches run concurrently through the provider gates, so latency is
+        set by the slowest batch rather than the sum of all of them.
+
+        Returns:
+            (translation, provider) pairs in the same order as texts; None for
+            each segment of a batch that failed, so other batches are kept
+        """
+        if not texts:
+            return []
+        if not self.available_providers:
+            return [(f"[MOCK TRANSLATION] {text} (to {target_language})", "mock") for text in texts]
+
+        if self.google_client:
+            batches = self._make_batches(texts, TRANSLATION_GOOGLE_BATCH_CHARS, GOOGLE_MAX_SEGMENTS)
+        else:
+            batches = self._make_batches(texts, TRANSLATION_OPENAI_BATCH_CHARS)
+
+        results = await asyncio.gather(*(
+            provider_router.call(self._provider_calls(batch, target_language), characters=sum(len(text) for text in batch))
+            for batch in batches
+        ), return_exceptions=True)
+
+        translated: List[Optional[Tuple[str, str]]] = []
+        failed = 0
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error during batched translation of {len(batch)} segments: {result}")
+                failed += 1
+                translated.extend([None] * len(batch))
+            else:
+                batch_translations, provider = result
+                translated.extend((segment.strip(), provider) for segment in batch_translations)
+
+        logger.info(f"Translated {len(texts)} segments in {len(batches)} batches ({failed} failed).")
+        return translated
+
+    def _make_batches(self, texts: List[str], max_chars: int, max_items: Optional[int] = None) -> List[List[str]]:
+        """Pack texts, in order, into batches under a character (and item) budget."""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_chars = 0
+        for text in texts:
+            full = current and (current_chars + len(text) > max_chars or (max_items and len(current) >= max_items))
+            if full:
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(text)
+            current_chars += len(text)
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _with_protection(self, texts: List[str],
+                               translate_batch: Callable[[List[str]], Awaitable[List[str]]]) -> List[str]:
+        """
+        Translate texts with their non-translatable spans replaced by placeholders.
+
+        Texts that are nothing but protected spans are returned unchanged
+        without a provider call.
+        """
+        protected = [protect(text) for text in texts]
+        pending = [i for i, item in enumerate(protected) if item.needs_translation]
+        results = list(texts)
+        if pending:
+            translated = await translate_batch([protected[i].text for i in pending])
+            for i, translated_text in zip(pending, translated):
+                results[i] = self._restore(translated_text, protected[i])
+        return results
+
+    def _restore(self, translated: str, protected: ProtectedText) -> str:
+        text, repaired = restore(translated, protected)
+        if repaired and len(repaired) == len(protected.spans):
+            logger.warning(f"Provider dropped all {len(repaired)} protected spans; keeping the untranslated segment.")
+        elif repaired:
+            logger.warning(f"Provider dropped {len(repaired)} of {len(protected.spans)} protected spans; re-inserted them.")
+        return text
+
+    async def _google_batch(self, texts: List[str], target_language: str) -> List[str]:
+        async def request(batch: List[str]) -> List[str]:
+            results = await provider_gates["google"].run(
+                self.google_client.translate,
+                batch,
+                target_language=target_language,
+                source_language='en',
+                format_='text'
+            )
+            return [result['translatedText'] for result in results]
+
+        return await self._with_protection(texts, request)
+
+    async def _openai_batch(self, texts: List[str], target_language: str) -> List[str]:
+        async def request(batch: List[str]) -> List[str]:
+            # Router batches may be sized for Google; keep each completion small
+            chunks = self._make_batches(batch, TRANSLATION_OPENAI_BATCH_CHARS)
+            results = await asyncio.gather(*(self._openai_numbered(chunk, target_language) for chunk in chunks))
+            return [translated for chunk in results for translated in chunk]
+
+        return await self._with_protection(texts, request)
+
+    async def _openai_numbered(self, texts: List[str], target_language: str) -> List[str]:
+        if len(texts) == 1:
+            return [await self._openai_complete(texts[0], target_language)]
+
+        # Number the segments so the reply can be split back reliably
+        numbered = "\n\n".join(f"[[{i}]]\n{text}" for i, text in enumerate(texts))
+        reply = await self._openai_complete(numbered, target_language, numbered_segments=True)
+
+        parts = _SEGMENT_MARKER_RE.split(reply)
+        translated = {int(parts[i]): parts[i + 1].strip() for i in range(1, len(parts) - 1, 2)}
+        if set(translated) == set(range(len(texts))):
+            return [translated[i] for i in range(len(texts))]
+
+        logger.warning(f"OpenAI batch reply lost segment markers; translating {len(texts)} segments individually.")
+        return list(await asyncio.gather(*(self._openai_complete(text, target_language) for text in texts)))
+
+    def _openai_instructions(self, target_language: str) -> str:
+        target_lang_name = language_names.get(target_language, target_language)
+        return (
+            f"You are a professional translator. Translate the following English text to {target_lang_name}. "
+            "Preserve markdown formatting. Keep placeholders like ⟦0⟧ exactly as they are. "
+            "Only return the translated text, no explanations."
+        )
+
+    async def _openai_complete(self, text: str, target_language: str, numbered_segments: bool = False) -> str:
+        instructions = self._openai_instructions(target_language)
+        if numbered_segments:
+            instructions += " The text is split into segments headed by markers like [[0]]; keep every marker unchanged on its own line."
+
+        response = await provider_gates["openai"].run(
+            self.openai_client.chat.completions.create,
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": instructions},
+                {"role": "user", "content": text}
+            ],
+            temperature=0.3
+        )
+        return response.choices[0].message.content
 
     async def translate_text(self, text: str, target_language: str = "ur") -> Optional[str]:
         """
         Translates text to the target language.
-        Tries Google Translate first, falls back to OpenAI, then mock.
+        Uses the healthier of Google Translate and OpenAI, then mock.
         """
         if not text:
             return None
 
-        # Extract code blocks to preserve them
-        code_blocks = self._extract_code_blocks(text)
-        text_without_code = self._remove_code_blocks(text, code_blocks)
+        # Keep code, MDX syntax, math and URLs away from the provider
+        protected = protect(text)
+        if not protected.needs_translation:
+            return text
+
+        async def google_request() -> str:
+            result = await provider_gates["google"].run(
+                self.google_client.translate,
+                protected.text,
+                target_language=target_language,
+                source_language='en',
+                format_='text'
+            )
+            return result['translatedText']
+
+        async def openai_request() -> str:
+            return await self._openai_complete(protected.text, target_language)
+
+        calls = {}
+        if self.google_client:
+            calls["google"] = google_request
+        if self.openai_client:
+            calls["openai"] = openai_request
 
         try:
-            # Try Google Translate first
-            if self.google_client:
-                result = self.google_client.translate(
-                    text_without_code,
-                    target_language=target_language,
-                    source_language='en'
-                )
-                translated_text = result['translatedText']
-                # Restore code blocks
-                translated_text = self._restore_code_blocks(translated_text, code_blocks)
-                return translated_text
-
-            # Fall back to OpenAI
-            elif self.openai_client:
-                language_names = {
-                    'ur': 'Urdu',
-                    'ar': 'Arabic',
-                    'hi': 'Hindi',
-                    'es': 'Spanish',
-                    'fr': 'French'
-                }
-                target_lang_name = language_names.get(target_language, target_language)
-
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": f"You are a professional translator. Translate the following English text to {target_lang_name}. Preserve markdown formatting. Only return the translated text, no explanations."
-                        },
-                        {
-                            "role": "user",
-                            "content": text_without_code
-                        }
-                    ],
-                    temperature=0.3
-                )
-                translated_text = response.choices[0].message.content
-                # Restore code blocks
-                translated_text = self._restore_code_blocks(translated_text, code_blocks)
-                return translated_text
+            # Route to the healthier provider, failing over to the other
+            if calls:
+                translated_text, _ = await provider_router.call(calls, characters=len(protected.text))
+                return self._restore(translated_text, protected)
 
             # Mock response if no clients available
             else:
@@ -0,0 +1,52 @@
+"""
+Benchmark single-process vs multi-process embedding for full index builds.
+
+Usage:
+    python benchmark_indexing.py [workers] [max_chunks]
+
+Embeds the book chunks (no Qdrant upload) once in-process and once across a
+process pool, checks that both produce the same vectors in the same order,
+and prints the speedup. The embedding cache is bypassed, so both runs
+compute every vector.
+"""
+import sys
+import time
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services.indexing_service import indexing_service
+from app.services.parallel_embedding import resolve_worker_count
+
+if __name__ == "__main__":
+    workers = resolve_worker_count(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
+    max_chunks = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    print("=" * 60)
+    print("Indexing Embedding Benchmark")
+    print("=" * 60)
+
+    chunks = indexing_service.extract_book_content()
+    if max_chunks:
+        chunks = chunks[:max_chunks]
+    texts = [chunk['content'] for chunk in chunks]
+    if not texts:
+        print("[ERROR] No chunks found - is the frontend/docs directory available?")
+        sys.exit(1)
+    print(f"Chunks: {len(texts)}, workers: {workers}")
+
+    start = time.perf_counter()
+    single = indexing_service._compute_embeddings(texts, workers=1)
+    single_seconds = time.perf_counter() - start
+    print(f"\n[single]   {single_seconds:.2f}s  ({len(texts) / single_seconds:.1f} chunks/s)")
+
+    start = time.perf_counter()
+    parallel = indexing_service._compute_embeddings(texts, workers=workers)
+    parallel_seconds = time.perf_counter() - start
+    print(f"[parallel] {parallel_seconds:.2f}s  ({len(texts) / parallel_seconds:.1f} chunks/s)")
+
+    same_order = np.allclose(np.asarray(single, dtype=np.float32), np.asarray(parallel, dtype=np.float32), atol=1e-4)
+    print(f"\nSpeedup: {single_seconds / parallel_seconds:.2f}x")
+    print(f"Vectors match in order: {'[OK]' if same_order else '[ERROR] mismatch'}")